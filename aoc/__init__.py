@@ -0,0 +1,18 @@
+# coding: utf-8
+
+"""
+Shared tooling to run, time and inspect the daily solutions in a single process.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+
+this_dir: str = os.path.dirname(os.path.abspath(__file__))
+base_dir: str = os.path.dirname(this_dir)
+
+# make the day directories importable as namespace packages, e.g. "day17.code"
+if base_dir not in sys.path:
+    sys.path.insert(0, base_dir)
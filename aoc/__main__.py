@@ -0,0 +1,146 @@
+# coding: utf-8
+
+"""
+Command line interface, run from the repository root via "python -m aoc [DAY ...]".
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import argparse
+
+from aoc import cache, instrument, profiling, importtime
+from aoc.runner import (
+    select_days, run_days, format_report, format_spans, format_counters, format_memory, instrument_to_dict,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc", description=__doc__.strip())
+    parser.add_argument("days", nargs="*", help="days to run, e.g. '17' or 'day17', defaults to all")
+    parser.add_argument("--quiet", "-q", action="store_true", help="do not print the output of days")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        nargs="?",
+        const=0,
+        help="run days in a process pool with this many workers, defaults to the number of cores when no value is "
+        "given, longest days are scheduled first",
+    )
+    parser.add_argument("--budget", "-b", type=float, help="time budget per day in seconds")
+    parser.add_argument(
+        "--variants",
+        action="store_true",
+        help="also run alternative solutions such as day5/code_bruteforce.py",
+    )
+    parser.add_argument("--cache", action="store_true", help="cache parsed inputs on disk")
+    parser.add_argument("--clear-cache", action="store_true", help="invalidate all cached parsed inputs first")
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        help="size limit of the cache in MB, least recently used entries are evicted, default: "
+        f"{cache.default_size_mb}",
+    )
+    parser.add_argument(
+        "--phases",
+        action="store_true",
+        help="record and report the time spent in phases such as parse, part1 and part2 as well as in sub-spans, "
+        "and counters of hot loops",
+    )
+    parser.add_argument(
+        "--phases-json",
+        metavar="PATH",
+        help="write recorded phases, spans and counters to a JSON file",
+    )
+    parser.add_argument(
+        "--memory",
+        "-m",
+        action="store_true",
+        help="trace memory with tracemalloc and report peak and retained memory as well as the top allocation "
+        "sites per day and part",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DAY",
+        help="profile a single day instead, writing a .prof file and a collapsed stack file for flamegraph tools to "
+        f"{os.path.relpath(profiling.profiles_dir)}",
+    )
+    parser.add_argument(
+        "--part",
+        type=int,
+        help="part to profile, only solving it after parsing the input, defaults to the whole main() invocation",
+    )
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help="report the import time of the runner and of each day on top of it instead, measured in fresh "
+        "interpreters with 'python -X importtime'",
+    )
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        metavar="MS",
+        help="exit with a non-zero code when the import of any reported module takes longer than this",
+    )
+    args = parser.parse_args()
+
+    # configure the parse cache through the environment so that it is inherited by workers
+    if args.clear_cache:
+        cache.clear()
+    if args.cache:
+        os.environ["AOC_CACHE"] = "1"
+    if args.cache_size is not None:
+        os.environ["AOC_CACHE_SIZE_MB"] = str(args.cache_size)
+
+    # enable instrumentation before days are imported, also through the environment for workers
+    if args.phases or args.phases_json:
+        instrument.enable()
+
+    # report import times
+    if args.import_time:
+        budget: float | None = None if args.import_budget is None else args.import_budget / 1000
+        times = importtime.measure_days(select_days(args.days, variants=args.variants))
+        print(importtime.format_import_times(times, budget=budget))
+        failed: bool = any(t.error or (budget is not None and t.seconds > budget) for t in times.values())
+        return 1 if failed else 0
+
+    # profile a single day
+    if args.profile:
+        day = select_days([args.profile], variants=True)[0]
+        try:
+            prof_path, collapsed_path = profiling.profile_day(day, part=args.part)
+        except ValueError as e:
+            parser.error(str(e))
+        print("")
+        profiling.print_stats(prof_path)
+        print(f"written {prof_path}\nwritten {collapsed_path}")
+        return 0
+
+    # run and report
+    t0 = time.perf_counter()
+    results = run_days(
+        select_days(args.days, variants=args.variants),
+        jobs=args.jobs,
+        budget=args.budget,
+        memory=args.memory,
+        verbose=not args.quiet,
+    )
+    print(format_report(results, wall_seconds=time.perf_counter() - t0))
+    if args.memory:
+        print(f"\n{format_memory(results)}")
+    if args.phases:
+        print(f"\n{format_spans(results)}")
+        print(f"\n{format_counters(results)}")
+    if args.phases_json:
+        with open(args.phases_json, "w") as f:
+            json.dump(instrument_to_dict(results), f, indent=4)
+
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
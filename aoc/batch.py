@@ -0,0 +1,170 @@
+# coding: utf-8
+
+"""
+Batch mode that runs the solver of a single day over many input files, such as inputs of several
+accounts or generated stress inputs, distributing them over a process pool whose workers import
+the day once and reuse it for all files they receive. Results are streamed as JSON lines, one per
+input file and in order of completion, with timings per step.
+Run from the repository root via "python -m aoc.batch DAY INPUT [INPUT ...]".
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import traceback
+import contextlib
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TextIO
+
+from aoc.bench import parse_answers
+from aoc.runner import select_days, load_day, has_parts, time_budget, DayTimeout
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+def find_inputs(patterns: list[str]) -> list[str]:
+    # directories refer to all files they contain, everything else is treated as a glob pattern
+    paths: list[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches: list[str] = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            matches = glob.glob(pattern)
+        paths += sorted(path for path in matches if os.path.isfile(path))
+    if not paths:
+        raise ValueError(f"no input files found for {', '.join(patterns)}")
+    # drop duplicates but keep the order
+    return list(dict.fromkeys(paths))
+
+
+def _init_worker(day: str) -> None:
+    # import the day once when the worker starts, so that its tasks only look it up in sys.modules
+    load_day(day)
+
+
+def to_json(obj: Any) -> Any:
+    # numpy scalars and similar objects that are not natively serializable
+    return obj.item() if hasattr(obj, "item") else str(obj)
+
+
+def run_input(day: str, path: str, budget: float | None = None) -> dict[str, Any]:
+    """
+    Runs the solver of *day* on the input at *path* and returns a JSON serializable result with the
+    answers and the timings of the parse and solve steps, or of the main() invocation for days that
+    solve both parts at once. The day is imported on first use and reused by subsequent calls.
+    """
+    mod: ModuleType = load_day(day)
+
+    result: dict[str, Any] = {"day": day, "path": path, "ok": True, "timings": {}}
+    stdout: io.StringIO = io.StringIO()
+    t_start: float = time.perf_counter()
+
+    def invoke(label: str, func: Callable[..., Any], *args: Any) -> Any:
+        t0: float = time.perf_counter()
+        value: Any = func(*args)
+        result["timings"][label] = time.perf_counter() - t0
+        return value
+
+    try:
+        with contextlib.redirect_stdout(stdout), time_budget(budget):
+            if has_parts(mod):
+                parsed: Any = invoke("parse", mod.parse, path)
+                result["answers"] = [
+                    invoke(f"part{part}", getattr(mod, f"solve_part{part}"), parsed)
+                    for part in (1, 2)
+                ]
+            else:
+                invoke("main", mod.main, path)
+                # printed answers without the truths, which refer to the shipped input
+                result["answers"] = [value for value, _ in parse_answers(stdout.getvalue())]
+    except DayTimeout:
+        result.update(ok=False, timeout=True)
+    except Exception:
+        result.update(ok=False, error=traceback.format_exc().strip().splitlines()[-1])
+    result["seconds"] = time.perf_counter() - t_start
+
+    return result
+
+
+def run_batch(
+    day: str,
+    paths: list[str],
+    jobs: int | None = None,
+    budget: float | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Runs the solver of *day* on all input *paths* and yields results as they complete, either
+    sequentially in this process when *jobs* is *None*, or in a process pool with *jobs* workers,
+    defaulting to the number of cores when 0.
+    """
+    if jobs is None:
+        for path in paths:
+            yield run_input(day, path, budget=budget)
+        return
+
+    # largest files first, as they are likely to take longest
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    paths = sorted(paths, key=os.path.getsize, reverse=True)
+    n_workers: int = min(jobs or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(day,)) as pool:
+        futures: list[Future] = [pool.submit(run_input, day, path, budget) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_results(results: Iterator[dict[str, Any]], f: TextIO) -> list[dict[str, Any]]:
+    # stream one JSON line per result, flushing so that consumers see results right away
+    written: list[dict[str, Any]] = []
+    for result in results:
+        f.write(json.dumps(result, default=to_json) + "\n")
+        f.flush()
+        written.append(result)
+    return written
+
+
+def format_summary(results: list[dict[str, Any]], wall_seconds: float) -> str:
+    n_failed: int = sum(not result["ok"] for result in results)
+    total: float = sum(result["seconds"] for result in results)
+    return f"{len(results)} input(s), {n_failed} failed, total {total:.3f}s, wall {wall_seconds:.3f}s"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.batch", description=__doc__.strip())
+    parser.add_argument("day", help="day to run, e.g. '17' or 'day17'")
+    parser.add_argument("inputs", nargs="+", help="input files, directories or glob patterns")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        nargs="?",
+        const=0,
+        help="run inputs in a process pool with this many workers, defaults to the number of cores when no value is "
+        "given, largest inputs are scheduled first",
+    )
+    parser.add_argument("--budget", "-b", type=float, help="time budget per input in seconds")
+    parser.add_argument("--output", "-o", help="file to write JSON lines to, default: stdout")
+    args = parser.parse_args()
+
+    try:
+        day: str = select_days([args.day], variants=True)[0]
+        paths: list[str] = find_inputs(args.inputs)
+    except ValueError as e:
+        parser.error(str(e))
+
+    t0: float = time.perf_counter()
+    with open(args.output, "w") if args.output else contextlib.nullcontext(sys.stdout) as f:
+        results = write_results(run_batch(day, paths, jobs=args.jobs, budget=args.budget), f)
+    print(format_summary(results, time.perf_counter() - t0), file=sys.stderr)
+
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
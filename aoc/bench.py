@@ -0,0 +1,366 @@
+# coding: utf-8
+
+"""
+Benchmark suite that runs the main() invocations of all days, or their parsing and solving steps
+separately for days that support it, repeatedly after some warmup runs,
+records min, median and p95 times as well as peak and retained memory to a JSON history file, checks
+printed answers against their embedded truth values, and fails when days regress in time or memory
+compared to the history.
+Run from the repository root via "python -m aoc.bench [DAY ...]".
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+import sys
+import json
+import math
+import time
+import argparse
+import datetime
+import platform
+import statistics
+import functools
+import traceback
+import contextlib
+import subprocess
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from aoc import base_dir
+from aoc.memory import MemoryUsage, trace_memory
+from aoc.runner import select_days, load_day, has_parts, get_data_path, time_budget, DayTimeout
+
+
+history_file: str = os.path.join(base_dir, ".aoc", "bench.json")
+
+# printed answers look like "name=value (truth=value)", with some days printing only the value
+answer_cre = re.compile(r"(-?\d+)\s+\(truth=(-?\d+)\)")
+
+
+@dataclass
+class PartBench:
+    day: str
+    label: str
+    times: list[float] = field(default_factory=list)
+    memory: MemoryUsage | None = None
+    answers: list[tuple[int, int]] = field(default_factory=list)
+    error: str | None = None
+    timed_out: bool = False
+    # whether the benchmarked step yields answers at all, which is not the case for parsing
+    has_answers: bool = True
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def p95(self) -> float:
+        # nearest-rank percentile
+        times: list[float] = sorted(self.times)
+        return times[max(math.ceil(0.95 * len(times)) - 1, 0)]
+
+    @property
+    def peak_bytes(self) -> int | None:
+        return self.memory.peak_bytes if self.memory else None
+
+    @property
+    def correct(self) -> bool:
+        if not self.has_answers:
+            return True
+        return bool(self.answers) and all(value == truth for value, truth in self.answers)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out and bool(self.times)
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "correct": self.correct,
+            "answers": [list(answer) for answer in self.answers],
+            "peak_bytes": self.peak_bytes,
+        }
+        if self.memory:
+            data.update(retained_bytes=self.memory.retained_bytes, top_sites=self.memory.to_dict()["top_sites"])
+        if self.times:
+            data.update(runs=len(self.times), min=self.min, median=self.median, p95=self.p95)
+        if self.timed_out:
+            data["timeout"] = True
+        if self.error:
+            data["error"] = self.error.strip().splitlines()[-1]
+        return data
+
+
+def parse_answers(output: str) -> list[tuple[int, int]]:
+    return [(int(value), int(truth)) for value, truth in answer_cre.findall(output)]
+
+
+def bench_part(
+    day: str,
+    label: str,
+    func: Callable[[], Any],
+    repeat: int = 5,
+    warmup: int = 1,
+    memory: bool = True,
+    budget: float | None = None,
+    truth: int | None = None,
+    has_answers: bool = True,
+) -> PartBench:
+    # answers are compared to the truth when given, and parsed from the printed output otherwise
+    bench: PartBench = PartBench(day, label, has_answers=has_answers)
+    try:
+        # warmup and timed runs, checking answers of the first run
+        for i in range(warmup + repeat):
+            with contextlib.redirect_stdout(io.StringIO()) as stdout, time_budget(budget):
+                t0: float = time.perf_counter()
+                value: Any = func()
+                t: float = time.perf_counter() - t0
+            if i == 0 and has_answers:
+                bench.answers = [(value, truth)] if truth is not None else parse_answers(stdout.getvalue())
+            if i >= warmup:
+                bench.times.append(t)
+
+        # separate run for memory tracing, which would otherwise distort times
+        if memory:
+            with trace_memory() as usage, contextlib.redirect_stdout(io.StringIO()), time_budget(budget):
+                func()
+            bench.memory = usage
+    except DayTimeout:
+        bench.timed_out = True
+    except Exception:
+        bench.error = traceback.format_exc()
+    return bench
+
+
+def bench_day(day: str, **kwargs: Any) -> list[PartBench]:
+    try:
+        mod = load_day(day)
+    except Exception:
+        return [PartBench(day, "import", error=traceback.format_exc())]
+
+    if not has_parts(mod):
+        return [bench_part(day, "main", mod.main, **kwargs)]
+
+    # parse once for the timed runs of both parts
+    benches: list[PartBench] = [
+        bench_part(day, "parse", functools.partial(mod.parse, get_data_path(day)), has_answers=False, **kwargs),
+    ]
+    try:
+        parsed: Any = mod.parse(get_data_path(day))
+    except Exception:
+        return benches
+    for part in (1, 2):
+        benches.append(bench_part(
+            day,
+            f"part{part}",
+            functools.partial(getattr(mod, f"solve_part{part}"), parsed),
+            truth=mod.truths[part - 1],
+            **kwargs,
+        ))
+    return benches
+
+
+def load_history(path: str = history_file) -> list[dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_history(entry: dict[str, Any], path: str = history_file) -> None:
+    history: list[dict[str, Any]] = load_history(path) + [entry]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+
+
+def get_commit() -> str | None:
+    try:
+        cmd = ["git", "rev-parse", "--short", "HEAD"]
+        return subprocess.check_output(cmd, cwd=base_dir, stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def make_entry(benches: list[PartBench], repeat: int, warmup: int) -> dict[str, Any]:
+    results: dict[str, dict[str, Any]] = {}
+    for bench in benches:
+        results.setdefault(bench.day, {})[bench.label] = bench.to_dict()
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "results": results,
+    }
+
+
+def get_reference(
+    history: list[dict[str, Any]],
+    day: str,
+    label: str,
+    key: str = "median",
+) -> dict[str, Any] | None:
+    # most recent successful measurement of the same invocation
+    for entry in reversed(history):
+        if (ref := entry["results"].get(day, {}).get(label, {})).get(key) is not None:
+            return ref
+    return None
+
+
+def find_regressions(
+    benches: list[PartBench],
+    history: list[dict[str, Any]],
+    threshold: float = 10.0,
+    min_seconds: float = 0.005,
+) -> dict[tuple[str, str], float]:
+    # relative increase of median times in percent, ignoring invocations that are too fast to
+    # be measured reliably
+    regressions: dict[tuple[str, str], float] = {}
+    for bench in benches:
+        if not bench.times or not (ref := get_reference(history, bench.day, bench.label)):
+            continue
+        if max(bench.median, ref["median"]) < min_seconds:
+            continue
+        change: float = 100.0 * (bench.median / ref["median"] - 1.0)
+        if change > threshold:
+            regressions[(bench.day, bench.label)] = change
+    return regressions
+
+
+def find_memory_regressions(
+    benches: list[PartBench],
+    history: list[dict[str, Any]],
+    threshold: float = 10.0,
+    min_bytes: int = 1024**2,
+) -> dict[tuple[str, str], float]:
+    # relative increase of peak memory in percent, ignoring invocations with small peaks
+    regressions: dict[tuple[str, str], float] = {}
+    for bench in benches:
+        if bench.peak_bytes is None or not (ref := get_reference(history, bench.day, bench.label, "peak_bytes")):
+            continue
+        if max(bench.peak_bytes, ref["peak_bytes"]) < min_bytes:
+            continue
+        change: float = 100.0 * (bench.peak_bytes / max(ref["peak_bytes"], 1) - 1.0)
+        if change > threshold:
+            regressions[(bench.day, bench.label)] = change
+    return regressions
+
+
+def format_table(
+    benches: list[PartBench],
+    regressions: dict[tuple[str, str], float],
+    memory_regressions: dict[tuple[str, str], float] | None = None,
+) -> str:
+    w: int = max([8] + [len(bench.day) + 2 for bench in benches])
+    header: str = (
+        f"{'day':<{w}}{'invocation':<28}{'min':>10}{'median':>10}{'p95':>10}{'peak MB':>10}  {'answer':<8}"
+        "regression"
+    )
+    lines: list[str] = [header, "-" * len(header)]
+    for bench in benches:
+        if bench.times:
+            times: str = f"{bench.min:>9.4f}s{bench.median:>9.4f}s{bench.p95:>9.4f}s"
+        else:
+            times = f"{'-':>10}" * 3
+        peak: str = f"{bench.peak_bytes / 1024**2:>10.2f}" if bench.peak_bytes is not None else f"{'-':>10}"
+        if bench.error:
+            answer: str = "error"
+        elif bench.timed_out:
+            answer = "timeout"
+        else:
+            answer = "ok" if bench.correct else "wrong"
+        changes: list[str] = []
+        if (change := regressions.get((bench.day, bench.label))) is not None:
+            changes.append(f"time +{change:.1f}%")
+        if (change := (memory_regressions or {}).get((bench.day, bench.label))) is not None:
+            changes.append(f"memory +{change:.1f}%")
+        regression: str = ", ".join(changes)
+        lines.append(f"{bench.day:<{w}}{bench.label:<28}{times}{peak}  {answer:<8}{regression}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.bench", description=__doc__.strip())
+    parser.add_argument("days", nargs="*", help="days to benchmark, e.g. '17' or 'day17', defaults to all")
+    parser.add_argument("--repeat", "-n", type=int, default=5, help="number of timed runs, default: %(default)s")
+    parser.add_argument("--warmup", "-w", type=int, default=1, help="number of warmup runs, default: %(default)s")
+    parser.add_argument("--budget", "-b", type=float, help="time budget per single run in seconds")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument(
+        "--threshold",
+        "-t",
+        type=float,
+        default=10.0,
+        help="maximum allowed increase of median times in percent, default: %(default)s",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.005,
+        help="ignore regressions of invocations faster than this, default: %(default)s",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=10.0,
+        help="maximum allowed increase of peak memory in percent, default: %(default)s",
+    )
+    parser.add_argument(
+        "--min-mb",
+        type=float,
+        default=1.0,
+        help="ignore memory regressions of invocations with smaller peaks in MB, default: %(default)s",
+    )
+    parser.add_argument("--history", default=history_file, help="history file, default: %(default)s")
+    parser.add_argument("--no-save", action="store_true", help="do not append results to the history")
+    args = parser.parse_args()
+
+    # run benchmarks
+    benches: list[PartBench] = []
+    for day in select_days(args.days):
+        print(f"benchmarking {day} ...", file=sys.stderr)
+        benches += bench_day(
+            day,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            memory=not args.no_memory,
+            budget=args.budget,
+        )
+
+    # compare to history and report
+    history: list[dict[str, Any]] = load_history(args.history)
+    regressions = find_regressions(benches, history, threshold=args.threshold, min_seconds=args.min_seconds)
+    memory_regressions = find_memory_regressions(
+        benches,
+        history,
+        threshold=args.memory_threshold,
+        min_bytes=int(args.min_mb * 1024**2),
+    )
+    print(format_table(benches, regressions, memory_regressions))
+    for bench in benches:
+        if bench.error:
+            print(f"\n{bench.day} ({bench.label}) failed:\n{bench.error.rstrip()}")
+
+    if not args.no_save:
+        save_history(make_entry(benches, args.repeat, args.warmup), args.history)
+
+    # gate
+    failed: bool = (
+        bool(regressions) or
+        bool(memory_regressions) or
+        not all(bench.ok and bench.correct for bench in benches)
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
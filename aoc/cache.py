@@ -0,0 +1,167 @@
+# coding: utf-8
+
+"""
+Opt-in on-disk cache of parsed inputs. Entries are keyed by the SHA-256 of the input file, of the
+source file that defines the parser and of the source files of shared modules whose objects end up
+in parsed results, so editing any of them invalidates the cached result.
+The cache is enabled by setting AOC_CACHE=1 (or "python -m aoc --cache") and its total size is
+capped by evicting least recently used entries.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import functools
+import contextlib
+from typing import Any, Callable, TypeVar
+
+from aoc import base_dir
+from aoc.loader import Input
+
+
+T = TypeVar("T")
+
+cache_dir: str = os.path.join(base_dir, ".aoc", "cache")
+
+# default size cap of the cache directory in MB
+default_size_mb: float = 256.0
+
+# version of the layout of cache entries, to be increased when it changes in ways that are not
+# covered by the hashed source files, e.g. when updating python or numpy changes pickled objects
+format_version: int = 1
+
+# modules whose source files are part of all keys, as parsers build objects defined there, such as
+# grids of the loader or padded grids
+dependencies: tuple[str, ...] = ("aoc.loader", "aoc.grid")
+
+
+def is_enabled() -> bool:
+    return os.getenv("AOC_CACHE", "0").lower() in ("1", "true", "yes")
+
+
+def get_size_limit() -> int:
+    return int(float(os.getenv("AOC_CACHE_SIZE_MB", default_size_mb)) * 1024**2)
+
+
+def clear() -> None:
+    # like all modules below that are only needed when the cache is used, shutil is imported
+    # lazily, so that days importing cached_parse do not pay for it when the cache is disabled
+    import shutil
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def file_hash(path: str) -> str:
+    # hash directly from the mapping to avoid reading the file into memory
+    import hashlib
+    return hashlib.sha256(Input(path).raw).hexdigest()
+
+
+def get_key(func: Callable, path: str, *args: Any, modules: tuple[str, ...] = ()) -> str:
+    # the module name is part of the key since pickled objects refer to their module, which is
+    # "__main__" when a day is run as a script
+    import hashlib
+    import importlib
+    h = hashlib.sha256()
+    h.update(f"{format_version}:{func.__module__}:{func.__qualname__}:{args!r}".encode("utf-8"))
+    h.update(file_hash(sys.modules[func.__module__].__file__).encode("utf-8"))
+    for module in dependencies + modules:
+        h.update(file_hash(importlib.import_module(module).__file__).encode("utf-8"))
+    h.update(file_hash(path).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _is_array(obj: Any) -> bool:
+    # numpy is optional, an array can only exist when it was imported already
+    return "numpy" in sys.modules and isinstance(obj, sys.modules["numpy"].ndarray)
+
+
+def load(key: str) -> tuple[bool, Any]:
+    import pickle
+    for ext in ("pkl", "npy"):
+        if not os.path.exists(path := os.path.join(cache_dir, f"{key}.{ext}")):
+            continue
+        try:
+            if path.endswith(".npy"):
+                import numpy as np
+                obj = np.load(path, allow_pickle=False)
+            else:
+                with open(path, "rb") as f:
+                    obj = pickle.load(f)
+        except Exception:
+            # unreadable or stale entry, e.g. after renaming a class
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            continue
+        # touch for lru bookkeeping
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        return True, obj
+    return False, None
+
+
+def save(key: str, obj: Any) -> None:
+    os.makedirs(cache_dir, exist_ok=True)
+    path: str = os.path.join(cache_dir, f"{key}.{'npy' if _is_array(obj) else 'pkl'}")
+
+    # write to a temporary file first so that concurrent readers never see partial entries
+    tmp_path: str = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        if _is_array(obj):
+            import numpy as np
+            np.save(f, obj, allow_pickle=False)
+        else:
+            import pickle
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+    evict()
+
+
+def evict(size_limit: int | None = None) -> None:
+    # remove least recently used entries until the total size is below the limit
+    import glob
+    if size_limit is None:
+        size_limit = get_size_limit()
+    entries: list[tuple[float, int, str]] = []
+    for path in glob.glob(os.path.join(cache_dir, "*.npy")) + glob.glob(os.path.join(cache_dir, "*.pkl")):
+        # entries might be removed concurrently by other processes
+        with contextlib.suppress(FileNotFoundError):
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total: int = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= size_limit:
+            break
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        total -= size
+
+
+def cached_parse(
+    func: Callable[..., T] | None = None,
+    *,
+    modules: tuple[str, ...] = (),
+) -> Callable[..., T] | Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator for parse functions whose first argument is the path of the input file. Results are
+    only cached when the cache is enabled, otherwise the function is called as is. Besides the
+    :py:attr:`dependencies`, names of further *modules* whose source files should be part of the key
+    can be passed via ``@cached_parse(modules=(...))``.
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(path: str, *args: Any) -> T:
+            if not is_enabled():
+                return func(path, *args)
+
+            key: str = get_key(func, path, *args, modules=modules)
+            found, obj = load(key)
+            if not found:
+                obj = func(path, *args)
+                save(key, obj)
+            return obj
+
+        return wrapper
+
+    return decorator if func is None else decorator(func)
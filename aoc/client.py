@@ -0,0 +1,80 @@
+# coding: utf-8
+
+"""
+Thin client of the daemon in aoc/daemon.py, which only imports the standard library modules it
+needs so that a request costs little more than the interpreter startup.
+Run from the repository root via "python -m aoc.client solve DAY [--part N] [--input PATH]".
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import socket
+import argparse
+from typing import Any
+
+from aoc import base_dir
+
+
+socket_path: str = os.path.join(base_dir, ".aoc", "daemon.sock")
+
+
+def request(path: str, data: dict[str, Any], timeout: float | None = None) -> dict[str, Any]:
+    # send a single request as a JSON line and wait for the response line
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall((json.dumps(data) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as f:
+            line: bytes = f.readline()
+    if not line:
+        raise ConnectionError(f"no response from daemon at {path}")
+    return json.loads(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.client", description=__doc__.strip())
+    parser.add_argument("--socket", "-s", default=socket_path, help="socket path, default: %(default)s")
+    subparsers = parser.add_subparsers(dest="cmd", required=True)
+
+    solve_parser = subparsers.add_parser("solve", help="solve a day through the daemon")
+    solve_parser.add_argument("day", help="day to solve, e.g. '17' or 'day17'")
+    solve_parser.add_argument("--part", "-p", type=int, choices=(1, 2), help="single part to solve")
+    group = solve_parser.add_mutually_exclusive_group()
+    group.add_argument("--input", "-i", help="input file, defaults to the data.txt of the day")
+    group.add_argument("--hash", help="SHA-256 of an input the daemon has seen before")
+    solve_parser.add_argument("--json", action="store_true", help="print the full JSON response")
+
+    subparsers.add_parser("status", help="print the status of the daemon")
+    subparsers.add_parser("clear", help="drop all parsed inputs held by the daemon")
+    subparsers.add_parser("stop", help="stop the daemon")
+    args = parser.parse_args()
+
+    data: dict[str, Any] = {"cmd": args.cmd}
+    if args.cmd == "solve":
+        data.update(day=args.day, part=args.part, hash=args.hash)
+        # paths are resolved by the daemon, which might run in a different directory
+        if args.input:
+            data["input"] = os.path.abspath(args.input)
+    try:
+        response: dict[str, Any] = request(args.socket, data)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"no daemon running at {args.socket}, start it with 'python -m aoc.daemon'", file=sys.stderr)
+        return 1
+
+    if not response["ok"]:
+        print(f"error: {response['error']}", file=sys.stderr)
+        return 1
+    if args.cmd == "solve" and not args.json:
+        for name, value in response["answers"].items():
+            print(f"{name}={value}")
+    elif args.cmd != "stop":
+        print(json.dumps(response, indent=4))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+# coding: utf-8
+
+"""
+Long-lived local daemon that keeps all days imported and recently parsed inputs in memory, and
+answers solve requests over a Unix socket, so that repeated invocations skip the interpreter
+startup, imports and parsing. Requests and responses are single JSON lines.
+Run from the repository root via "python -m aoc.daemon" and query it with the thin client in
+aoc/client.py via "python -m aoc.client solve DAY [--part N] [--input PATH | --hash SHA256]".
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+import contextlib
+import socketserver
+from typing import Any
+
+from aoc import cache
+from aoc.bench import parse_answers
+from aoc.batch import to_json
+from aoc.client import socket_path, request
+from aoc.memo import memoize
+from aoc.runner import discover_days, select_days, load_day, has_parts, get_data_path, time_budget, DayTimeout
+
+
+# maximum number of parsed inputs kept in memory
+default_max_inputs: int = 32
+
+
+class DaemonState:
+    """
+    Loaded days, parsed inputs by day and content hash, and paths of inputs by content hash so that
+    later requests can refer to an input by its hash only.
+    """
+
+    def __init__(self, max_inputs: int = default_max_inputs, budget: float | None = None) -> None:
+        self.budget = budget
+        self.paths: dict[str, str] = {}
+        self.n_requests: int = 0
+        self.t_start: float = time.perf_counter()
+
+        # parsed inputs, keyed by day and content hash but not by the path the content was read from
+        self.parse = memoize(maxsize=max_inputs, key=lambda day, digest, path: (day, digest))(self._parse)
+
+    def _parse(self, day: str, digest: str, path: str) -> Any:
+        return load_day(day).parse(path)
+
+    def preload(self) -> list[str]:
+        days: list[str] = discover_days(variants=True)
+        for day in days:
+            load_day(day)
+        return days
+
+    def resolve(self, request: dict[str, Any]) -> tuple[str, str]:
+        # path and content hash of the requested input, defaulting to the data.txt of the day
+        if (digest := request.get("hash")) is not None:
+            if digest not in self.paths:
+                raise ValueError(f"unknown input hash {digest}, send a path first")
+            # the file might have changed since it was hashed, in which case parsing it would cache
+            # the new content under the old hash, so rehash and forget the outdated hash
+            path: str = self.paths[digest]
+            if (current := cache.file_hash(path)) != digest:
+                del self.paths[digest]
+                self.paths[current] = path
+                raise ValueError(f"input {path} changed since it was sent with hash {digest}, now {current}")
+            return path, digest
+        path = os.path.abspath(request.get("input") or get_data_path(request["day"]))
+        digest = cache.file_hash(path)
+        self.paths[digest] = path
+        return path, digest
+
+    def solve(self, request: dict[str, Any]) -> dict[str, Any]:
+        day: str = select_days([str(request["day"])], variants=True)[0]
+        part: int | None = request.get("part")
+        path, digest = self.resolve({**request, "day": day})
+        mod = load_day(day)
+
+        response: dict[str, Any] = {"ok": True, "day": day, "hash": digest}
+        t0: float = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) as stdout, time_budget(self.budget):
+            if has_parts(mod):
+                n_misses: int = self.parse.cache_info().misses
+                parsed: Any = self.parse(day, digest, path)
+                response["cached"] = self.parse.cache_info().misses == n_misses
+                parts: tuple[int, ...] = (part,) if part else (1, 2)
+                response["answers"] = {f"part{p}": getattr(mod, f"solve_part{p}")(parsed) for p in parts}
+            else:
+                # days that solve both parts at once in main()
+                if part:
+                    raise ValueError(f"{day} solves both parts in main() at once, cannot select part {part}")
+                mod.main(path)
+                response["answers"] = {
+                    f"part{p}": value
+                    for p, (value, _) in enumerate(parse_answers(stdout.getvalue()), 1)
+                }
+        response["seconds"] = time.perf_counter() - t0
+        return response
+
+    def status(self) -> dict[str, Any]:
+        info = self.parse.cache_info()
+        return {
+            "ok": True,
+            "pid": os.getpid(),
+            "uptime": time.perf_counter() - self.t_start,
+            "requests": self.n_requests,
+            "parsed_inputs": info.size,
+            "parse_hits": info.hits,
+            "parse_misses": info.misses,
+        }
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        self.n_requests += 1
+        cmd: str = request.get("cmd", "solve")
+        try:
+            if cmd == "solve":
+                return self.solve(request)
+            if cmd == "status":
+                return self.status()
+            if cmd == "clear":
+                self.parse.cache_clear()
+                self.paths.clear()
+                return {"ok": True}
+            raise ValueError(f"unknown command '{cmd}'")
+        except DayTimeout:
+            return {"ok": False, "error": "timeout"}
+        except Exception:
+            return {"ok": False, "error": traceback.format_exc().strip().splitlines()[-1]}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        server: DaemonServer = self.server  # type: ignore[assignment]
+        for line in self.rfile:
+            try:
+                request: dict[str, Any] = json.loads(line)
+            except ValueError:
+                response: dict[str, Any] = {"ok": False, "error": "invalid request"}
+            else:
+                if request.get("cmd") == "stop":
+                    response = {"ok": True}
+                    server.stopping = True
+                else:
+                    response = server.state.handle(request)
+            self.wfile.write((json.dumps(response, default=to_json) + "\n").encode("utf-8"))
+            if server.stopping:
+                break
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    Server that handles one connection at a time in the main thread, since days rely on global state
+    such as stdout redirection, instrumentation and signal based time budgets.
+    """
+
+    def __init__(self, path: str, state: DaemonState) -> None:
+        self.state = state
+        self.stopping: bool = False
+        super().__init__(path, _Handler)
+
+    def serve_until_stopped(self) -> None:
+        # unlike serve_forever(), this can be stopped by a request handled in the same thread
+        while not self.stopping:
+            self.handle_request()
+
+
+def serve(path: str = socket_path, max_inputs: int = default_max_inputs, budget: float | None = None) -> None:
+    # refuse to replace the socket of a running daemon, but remove stale ones
+    if os.path.exists(path):
+        try:
+            request(path, {"cmd": "status"}, timeout=1.0)
+        except OSError:
+            os.remove(path)
+        else:
+            raise RuntimeError(f"daemon already running at {path}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    state: DaemonState = DaemonState(max_inputs=max_inputs, budget=budget)
+    days: list[str] = state.preload()
+    with DaemonServer(path, state) as server:
+        print(f"serving {len(days)} days at {path} (pid {os.getpid()})", file=sys.stderr)
+        try:
+            server.serve_until_stopped()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.daemon", description=__doc__.strip())
+    parser.add_argument("--socket", "-s", default=socket_path, help="socket path, default: %(default)s")
+    parser.add_argument(
+        "--max-inputs",
+        type=int,
+        default=default_max_inputs,
+        help="maximum number of parsed inputs kept in memory, default: %(default)s",
+    )
+    parser.add_argument("--budget", "-b", type=float, help="time budget per request in seconds")
+    args = parser.parse_args()
+
+    try:
+        serve(args.socket, max_inputs=args.max_inputs, budget=args.budget)
+    except RuntimeError as e:
+        parser.error(str(e))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,501 @@
+# coding: utf-8
+
+"""
+Generators of synthetic, puzzle-shaped inputs for all days, used to benchmark solvers on inputs
+that are larger than the shipped data.txt files. The scale is a multiplier of the input size
+relative to the original puzzle input, so line based inputs get scale times more lines and grids
+get a side length that is sqrt(scale) times larger. Outputs are reproducible for a given seed.
+Run from the repository root via "python -m aoc.generate [DAY ...] --scale 10 100".
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import math
+import string
+import random
+import argparse
+import itertools
+from typing import Callable
+
+from aoc import base_dir
+
+
+Generator = Callable[[random.Random, float], str]
+
+out_dir: str = os.path.join(base_dir, ".aoc", "generated")
+
+generators: dict[str, Generator] = {}
+
+
+def generator(day: str) -> Callable[[Generator], Generator]:
+    def decorator(func: Generator) -> Generator:
+        generators[day] = func
+        return func
+    return decorator
+
+
+def n_scaled(n: int, scale: float) -> int:
+    return max(1, round(n * scale))
+
+
+def side_scaled(n: int, scale: float) -> int:
+    return max(1, round(n * math.sqrt(scale)))
+
+
+def unique_names(rng: random.Random, n: int, length: int, chars: str = string.ascii_lowercase) -> list[str]:
+    # random distinct names of fixed length
+    if n > len(chars)**length:
+        raise ValueError(f"cannot create {n} distinct names of length {length}")
+    names: set[str] = set()
+    while len(names) < n:
+        names.add("".join(rng.choices(chars, k=length)))
+    return rng.sample(sorted(names), n)
+
+
+def join_lines(lines: list[str]) -> str:
+    return "\n".join(lines) + "\n"
+
+
+@generator("day1")
+def generate_day1(rng: random.Random, scale: float) -> str:
+    # calibration lines of letters, digits and spelled-out digits, each with at least one digit
+    words: list[str] = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+    lines: list[str] = []
+    for _ in range(n_scaled(1000, scale)):
+        tokens: list[str] = [rng.choice(string.digits[1:])]
+        for _ in range(rng.randint(1, 8)):
+            r = rng.random()
+            if r < 0.3:
+                tokens.append(rng.choice(string.digits[1:]))
+            elif r < 0.6:
+                tokens.append(rng.choice(words))
+            else:
+                tokens.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 4))))
+        rng.shuffle(tokens)
+        lines.append("".join(tokens))
+    return join_lines(lines)
+
+
+@generator("day2")
+def generate_day2(rng: random.Random, scale: float) -> str:
+    lines: list[str] = []
+    for game_id in range(1, n_scaled(100, scale) + 1):
+        draws: list[str] = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {col}" for col in colors))
+        lines.append(f"Game {game_id}: {'; '.join(draws)}")
+    return join_lines(lines)
+
+
+@generator("day3")
+def generate_day3(rng: random.Random, scale: float) -> str:
+    # numbers with up to three digits and symbols scattered over a grid of dots
+    n: int = side_scaled(140, scale)
+    rows: list[list[str]] = [["."] * n for _ in range(n)]
+    for row in rows:
+        x: int = rng.randint(0, 3)
+        while x < n:
+            if rng.random() < 0.25:
+                row[x] = rng.choice("*#+$/=%@&-")
+                x += rng.randint(2, 6)
+            else:
+                num: str = str(rng.randint(1, 999))[:n - x]
+                row[x:x + len(num)] = list(num)
+                x += len(num) + rng.randint(1, 6)
+    return join_lines(["".join(row) for row in rows])
+
+
+@generator("day4")
+def generate_day4(rng: random.Random, scale: float) -> str:
+    # as in the original input, cards never win copies of cards past the end of the table
+    n_cards: int = n_scaled(200, scale)
+    lines: list[str] = []
+    for card_id in range(1, n_cards + 1):
+        n_matches: int = min(rng.choice([0, 0, 0, 0, 0, 0, 1, 1, 2, 3, 4, 6, 10]), n_cards - card_id)
+        nums: list[int] = rng.sample(range(1, 100), 35 - n_matches)
+        winning: list[int] = nums[:10]
+        card: list[int] = winning[:n_matches] + nums[10:]
+        rng.shuffle(card)
+        fmt = lambda nums: " ".join(f"{num:>2}" for num in nums)
+        lines.append(f"Card {card_id:>{len(str(n_cards))}}: {fmt(winning)} | {fmt(card)}")
+    return join_lines(lines)
+
+
+@generator("day5")
+def generate_day5(rng: random.Random, scale: float) -> str:
+    # seed ranges and seven layers of mappings with non-overlapping source ranges and gaps
+    max_val: int = 2**32
+    seeds: list[int] = []
+    for _ in range(n_scaled(10, scale)):
+        start: int = rng.randrange(max_val // 2)
+        seeds += [start, rng.randrange(1, max_val // 20)]
+    blocks: list[str] = [f"seeds: {' '.join(map(str, seeds))}"]
+    names: list[str] = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    for src_name, dst_name in zip(names[:-1], names[1:]):
+        n_ranges: int = n_scaled(35, scale)
+        bounds: list[int] = sorted(rng.sample(range(max_val), 2 * n_ranges))
+        lines: list[str] = []
+        for src_start, src_end in zip(bounds[::2], bounds[1::2]):
+            n: int = src_end - src_start
+            lines.append(f"{rng.randrange(max_val - n)} {src_start} {n}")
+        rng.shuffle(lines)
+        blocks.append("\n".join([f"{src_name}-to-{dst_name} map:"] + lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+@generator("day6")
+def generate_day6(rng: random.Random, scale: float) -> str:
+    # the number of races is fixed by the concatenation in part 2, so durations scale instead
+    times: list[int] = [rng.randint(n_scaled(40, scale), n_scaled(100, scale)) for _ in range(4)]
+    distances: list[int] = [rng.randint(t, t**2 // 4 - 1) for t in times]
+    w: int = max(len(str(v)) for v in times + distances) + 2
+    return join_lines([
+        "Time:    " + "".join(f"{t:>{w}}" for t in times),
+        "Distance:" + "".join(f"{d:>{w}}" for d in distances),
+    ])
+
+
+@generator("day7")
+def generate_day7(rng: random.Random, scale: float) -> str:
+    # hands must be distinct since ties are not allowed, which caps the number at 13^5
+    cards: str = "23456789TJQKA"
+    n_hands: int = min(n_scaled(1000, scale), len(cards)**5)
+    hands: set[str] = set()
+    while len(hands) < n_hands:
+        # bias towards repeated cards to get all kinds of scores
+        pool: str = "".join(rng.sample(cards, rng.randint(1, 5)))
+        hands.add("".join(rng.choices(pool, k=5)))
+    return join_lines([f"{hand} {rng.randint(1, 1000)}" for hand in sorted(hands, key=lambda _: rng.random())])
+
+
+@generator("day8")
+def generate_day8(rng: random.Random, scale: float) -> str:
+    # ghosts walk on separate chains whose lengths are multiples of the number of instructions,
+    # with z nodes leading back to the node behind their a node, which is what part 2 relies on;
+    # node names are limited to three characters which caps the number of nodes at around 38k
+    cycles: list[int] = [2, 3, 5, 7, 11, 13]
+    n_instructions: int = max(2, min(n_scaled(18, scale), 38_000 // sum(cycles)))
+    instructions: list[str] = ["L", "R"] + rng.choices("LR", k=n_instructions - 2)
+    rng.shuffle(instructions)
+
+    # names of inner nodes must not end with A or Z
+    chars: str = string.ascii_uppercase + string.digits
+    n_nodes: int = n_instructions * sum(cycles)
+    inner_names: list[str] = rng.sample(
+        [a + b + c for a, b, c in itertools.product(chars, chars, chars.replace("A", "").replace("Z", ""))],
+        n_nodes,
+    )
+    end_names: list[str] = [name for name in unique_names(rng, len(cycles) + 2, 2, chars) if name not in ("AA", "ZZ")]
+
+    lines: list[str] = []
+    for i, n_cycles in enumerate(cycles):
+        # the first ghost starts at AAA and ends at ZZZ for part 1
+        a, z = ("AAA", "ZZZ") if i == 0 else (end_names[i] + "A", end_names[i] + "Z")
+        chain: list[str] = [a] + [inner_names.pop() for _ in range(n_cycles * n_instructions - 1)] + [z]
+        for name, next_name in zip(chain[:-1], chain[1:]):
+            lines.append(f"{name} = ({next_name}, {next_name})")
+        lines.append(f"{z} = ({chain[1]}, {chain[1]})")
+    rng.shuffle(lines)
+
+    return "".join(instructions) + "\n\n" + join_lines(lines)
+
+
+@generator("day9")
+def generate_day9(rng: random.Random, scale: float) -> str:
+    # sequences of 21 values of random polynomials
+    lines: list[str] = []
+    for _ in range(n_scaled(200, scale)):
+        coeffs: list[int] = [rng.randint(-10, 10) for _ in range(rng.randint(1, 7))]
+        lines.append(" ".join(str(sum(c * x**i for i, c in enumerate(coeffs))) for x in range(21)))
+    return join_lines(lines)
+
+
+@generator("day10")
+def generate_day10(rng: random.Random, scale: float) -> str:
+    # build a random spanning tree on a coarse lattice, draw it with corridors on a grid that is
+    # four times finer and let the loop run around the tree, so it is simple and closed by
+    # construction; all other tiles are random junk
+    k: int = max(2, side_scaled(35, scale))
+    n: int = 4 * k + 1
+    corridor: set[tuple[int, int]] = {(2, 2)}
+    visited: set[tuple[int, int]] = {(0, 0)}
+    stack: list[tuple[int, int]] = [(0, 0)]
+    while stack:
+        i, j = stack[-1]
+        options = [
+            (i + di, j + dj) for di, dj in ((0, 1), (1, 0), (0, -1), (-1, 0))
+            if 0 <= i + di < k and 0 <= j + dj < k and (i + di, j + dj) not in visited
+        ]
+        if not options:
+            stack.pop()
+            continue
+        i2, j2 = rng.choice(options)
+        visited.add((i2, j2))
+        stack.append((i2, j2))
+        for d in range(5):
+            corridor.add((4 * i + 2 + d * (i2 - i), 4 * j + 2 + d * (j2 - j)))
+
+    # the loop consists of all tiles touching the corridor
+    loop: set[tuple[int, int]] = {
+        (x + dx, y + dy)
+        for x, y in corridor
+        for dx, dy in itertools.product((-1, 0, 1), repeat=2)
+    } - corridor
+
+    # draw pipes depending on loop neighbors
+    pipes: dict[str, str] = {"du": "|", "lr": "-", "ru": "L", "lu": "J", "dl": "7", "dr": "F"}
+    rows: list[list[str]] = [rng.choices("|-LJ7F.", k=n) for _ in range(n)]
+    for x, y in loop:
+        dirs = "".join(sorted(
+            d for d, (dx, dy) in zip("udlr", ((0, -1), (0, 1), (-1, 0), (1, 0)))
+            if (x + dx, y + dy) in loop
+        ))
+        rows[y][x] = pipes[dirs]
+
+    # place the start, surrounded by ground to avoid false connections, but not on an "L" since
+    # the solution does not expect it
+    sx, sy = rng.choice(sorted((x, y) for x, y in loop if rows[y][x] != "L"))
+    rows[sy][sx] = "S"
+    for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+        if 0 <= sx + dx < n and 0 <= sy + dy < n and (sx + dx, sy + dy) not in loop:
+            rows[sy + dy][sx + dx] = "."
+
+    return join_lines(["".join(row) for row in rows])
+
+
+@generator("day11")
+def generate_day11(rng: random.Random, scale: float) -> str:
+    # galaxies with empty rows and columns in between
+    n: int = side_scaled(140, scale)
+    empty_rows: set[int] = set(rng.sample(range(n), n // 20))
+    empty_cols: set[int] = set(rng.sample(range(n), n // 20))
+    return join_lines([
+        "".join(
+            "#" if y not in empty_rows and x not in empty_cols and rng.random() < 0.025 else "."
+            for x in range(n)
+        )
+        for y in range(n)
+    ])
+
+
+@generator("day12")
+def generate_day12(rng: random.Random, scale: float) -> str:
+    # valid arrangements with some of the springs being unknown
+    lines: list[str] = []
+    for _ in range(n_scaled(1000, scale)):
+        groups: list[int] = [rng.randint(1, 4) for _ in range(rng.randint(1, 5))]
+        springs: str = "." * rng.randint(0, 2) + ".".join(
+            "#" * group + "." * rng.randint(0, 1)
+            for group in groups
+        ) + "." * rng.randint(0, 2)
+        conditions: str = "".join("?" if rng.random() < 0.4 else c for c in springs)
+        lines.append(f"{conditions} {','.join(map(str, groups))}")
+    return join_lines(lines)
+
+
+@generator("day13")
+def generate_day13(rng: random.Random, scale: float) -> str:
+    # random patterns with one horizontal or vertical line of reflection
+    patterns: list[str] = []
+    for _ in range(n_scaled(100, scale)):
+        n_rows, n_cols = rng.randint(5, 17), rng.randint(5, 17)
+        rows: list[list[str]] = [rng.choices("#.", k=n_cols) for _ in range(n_rows)]
+        transposed: bool = rng.random() < 0.5
+        if transposed:
+            rows = [list(col) for col in zip(*rows)]
+            n_rows, n_cols = n_cols, n_rows
+        # mirror rows at a random line
+        i: int = rng.randint(1, n_rows - 1)
+        for d in range(min(i, n_rows - i)):
+            rows[i + d] = list(rows[i - 1 - d])
+        if transposed:
+            rows = [list(col) for col in zip(*rows)]
+        patterns.append("\n".join("".join(row) for row in rows))
+    return "\n\n".join(patterns) + "\n"
+
+
+@generator("day14")
+def generate_day14(rng: random.Random, scale: float) -> str:
+    # note that on larger grids, the period of north loads quickly exceeds the 100 cycles that
+    # part 2 expects, so only part 1 is meaningful beyond scales of a few
+    n: int = side_scaled(100, scale)
+    return join_lines(["".join(rng.choices(".#O", weights=[0.63, 0.17, 0.2], k=n)) for _ in range(n)])
+
+
+@generator("day15")
+def generate_day15(rng: random.Random, scale: float) -> str:
+    labels: list[str] = unique_names(rng, n_scaled(500, scale), 6)
+    labels = [label[:rng.randint(2, 6)] for label in labels]
+    steps: list[str] = [
+        f"{label}-" if rng.random() < 0.3 else f"{label}={rng.randint(1, 9)}"
+        for label in rng.choices(labels, k=n_scaled(4000, scale))
+    ]
+    return ",".join(steps) + "\n"
+
+
+@generator("day16")
+def generate_day16(rng: random.Random, scale: float) -> str:
+    n: int = side_scaled(110, scale)
+    return join_lines([
+        "".join(rng.choices(".|-/\\", weights=[0.9, 0.025, 0.025, 0.025, 0.025], k=n))
+        for _ in range(n)
+    ])
+
+
+@generator("day17")
+def generate_day17(rng: random.Random, scale: float) -> str:
+    n: int = side_scaled(141, scale)
+    return join_lines(["".join(rng.choices("123456789", k=n)) for _ in range(n)])
+
+
+@generator("day18")
+def generate_day18(rng: random.Random, scale: float) -> str:
+    # both parts describe a histogram-shaped polygon with the same number of edges, which is
+    # simple and closed by construction
+    n_cols: int = n_scaled(350, scale)
+
+    def polygon(max_width: int, max_height: int) -> list[tuple[str, int]]:
+        widths: list[int] = [rng.randint(1, max_width) for _ in range(n_cols)]
+        heights: list[int] = [rng.randint(1, max_height)]
+        for _ in range(n_cols - 1):
+            # neighboring heights must differ to avoid zero length edges
+            while (h := rng.randint(1, max_height)) == heights[-1]:
+                pass
+            heights.append(h)
+        edges: list[tuple[str, int]] = [("R", sum(widths)), ("U", heights[-1])]
+        for i in range(n_cols - 1, 0, -1):
+            edges.append(("L", widths[i]))
+            diff: int = heights[i - 1] - heights[i]
+            edges.append(("U" if diff > 0 else "D", abs(diff)))
+        edges += [("L", widths[0]), ("D", heights[0])]
+        return edges
+
+    # part 2 distances are encoded in five hex digits, so sums must stay below 0xfffff
+    edges1 = polygon(10, 10)
+    edges2 = polygon(0xfffff // n_cols, 0xfffff // 2)
+    return join_lines([
+        f"{d1} {n1} (#{n2:05x}{'RDLU'.index(d2)})"
+        for (d1, n1), (d2, n2) in zip(edges1, edges2)
+    ])
+
+
+@generator("day19")
+def generate_day19(rng: random.Random, scale: float) -> str:
+    # a tree of workflows starting at "in", so that there are no cycles
+    n_workflows: int = n_scaled(550, scale)
+    names: list[str] = unique_names(rng, n_workflows - 1, 4)
+    queue: list[str] = ["in"]
+    lines: list[str] = []
+    while queue:
+        name: str = queue.pop(0)
+        targets: list[str] = []
+        for _ in range(rng.randint(2, 4)):
+            if names and rng.random() < 0.7:
+                targets.append(names.pop())
+                queue.append(targets[-1])
+            else:
+                targets.append(rng.choice("AR"))
+        conds: list[str] = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target}"
+            for target in targets[:-1]
+        ]
+        lines.append(f"{name}{{{','.join(conds + targets[-1:])}}}")
+    rng.shuffle(lines)
+
+    parts: list[str] = [
+        "{" + ",".join(f"{attr}={rng.randint(1, 4000)}" for attr in "xmas") + "}"
+        for _ in range(n_scaled(200, scale))
+    ]
+
+    return join_lines(lines) + "\n" + join_lines(parts)
+
+
+@generator("day20")
+def generate_day20(rng: random.Random, scale: float) -> str:
+    # binary counters of 12 flip-flops, each resetting through a conjunction hub once it reaches
+    # a random odd period, followed by an inverter that feeds the final conjunction before rx
+    n_bits: int = 12
+    n_counters: int = n_scaled(4, scale)
+    names: list[str] = unique_names(rng, n_counters * (n_bits + 2) + 1, 4)
+    final: str = names.pop()
+    broadcaster_outputs: list[str] = []
+    lines: list[str] = []
+    for _ in range(n_counters):
+        period: int = rng.randrange(2**(n_bits - 1) + 1, 2**n_bits, 2)
+        flip_flops: list[str] = [names.pop() for _ in range(n_bits)]
+        hub, inverter = names.pop(), names.pop()
+        broadcaster_outputs.append(flip_flops[0])
+        for i, ff in enumerate(flip_flops):
+            outputs: list[str] = flip_flops[i + 1:i + 2]
+            if period & (1 << i):
+                outputs.append(hub)
+            lines.append(f"%{ff} -> {', '.join(outputs)}")
+        # the hub feeds all flip-flops whose bit is not set, plus the first one
+        hub_outputs: list[str] = [ff for i, ff in enumerate(flip_flops) if not period & (1 << i) or i == 0]
+        lines.append(f"&{hub} -> {', '.join(hub_outputs + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+    lines.append(f"&{final} -> rx")
+    rng.shuffle(lines)
+    return join_lines([f"broadcaster -> {', '.join(broadcaster_outputs)}"] + lines)
+
+
+@generator("day21")
+def generate_day21(rng: random.Random, scale: float) -> str:
+    # the solution requires that the fixed number of steps reaches the edge of a patch exactly,
+    # which only works for dimensions 131 and 393 (the only odd divisors of 2 * 26501365 + 1 with
+    # an odd cofactor above 3), so the scale is capped at 393^2 / 131^2 = 9; rows and columns
+    # through the center, the border and the diamond in between are kept free of rocks
+    dim: int = 131 if side_scaled(131, scale) < 262 else 393
+    center: int = dim // 2
+    rows: list[str] = []
+    for y in range(dim):
+        rows.append("".join(
+            "S" if x == y == center else (
+                "." if (
+                    x in (0, center, dim - 1) or
+                    y in (0, center, dim - 1) or
+                    abs(x - center) + abs(y - center) == center or
+                    rng.random() > 0.12
+                ) else "#"
+            )
+            for x in range(dim)
+        ))
+    return join_lines(rows)
+
+
+def generate(day: str, scale: float = 1.0, seed: int = 0) -> str:
+    # the seed is combined with the day so that different days do not share random sequences
+    return generators[day](random.Random(f"{day}:{seed}"), scale)
+
+
+def write(day: str, scale: float = 1.0, seed: int = 0, directory: str = out_dir) -> str:
+    path: str = os.path.join(directory, day, f"scale{scale:g}_seed{seed}.txt")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(generate(day, scale=scale, seed=seed))
+    return path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.generate", description=__doc__.strip())
+    parser.add_argument("days", nargs="*", help="days to generate inputs for, e.g. '17' or 'day17', defaults to all")
+    parser.add_argument("--scale", "-s", type=float, nargs="+", default=[1.0], help="input size multipliers")
+    parser.add_argument("--seed", type=int, nargs="+", default=[0], help="random seeds, default: %(default)s")
+    parser.add_argument("--out", "-o", default=out_dir, help="output directory, default: %(default)s")
+    args = parser.parse_args()
+
+    days: list[str] = [day if day.startswith("day") else f"day{day}" for day in args.days] or list(generators)
+    for day in days:
+        if day not in generators:
+            parser.error(f"no generator for '{day}'")
+        for scale, seed in itertools.product(args.scale, args.seed):
+            print(write(day, scale=scale, seed=seed, directory=args.out))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# coding: utf-8
+
+"""
+Compact 2D grid of byte values, stored in a single flat bytearray and surrounded by a border of
+sentinel cells, replacing maps of coordinate tuples to per-cell objects.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from aoc.loader import Grid
+
+
+class PaddedGrid:
+    """
+    Mutable grid of byte values stored row by row in a flat bytearray, with a border of *border*
+    cells around it. Cells are addressed by flat indices, so that neighbors of any inner cell are
+    reached by adding fixed offsets without bounds checks, and hitting the border value signals
+    that a walk left the grid. Use :py:meth:`index` and :py:meth:`coord` to convert from and to
+    zero-based (x, y) coordinates of inner cells.
+    """
+
+    def __init__(self, n_rows: int, n_cols: int, fill: int = 0, border: int = 0) -> None:
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.stride = n_cols + 2
+        self.border = border
+
+        # fill all cells with the border, then overwrite inner cells row by row
+        self.cells = bytearray([border]) * (self.stride * (n_rows + 2))
+        if fill != border:
+            inner: bytes = bytes([fill]) * n_cols
+            for y in range(n_rows):
+                start: int = self.index(0, y)
+                self.cells[start:start + n_cols] = inner
+
+        # offsets to neighbors by direction, and groups of direct and diagonal neighbors
+        self.offsets: dict[str, int] = {"u": -self.stride, "d": self.stride, "l": -1, "r": 1}
+        self.neighbors4: tuple[int, ...] = (-self.stride, 1, self.stride, -1)
+        self.neighbors8: tuple[int, ...] = self.neighbors4 + (
+            -self.stride - 1, -self.stride + 1, self.stride - 1, self.stride + 1,
+        )
+
+    @classmethod
+    def from_grid(cls, grid: Grid, border: int = 0) -> PaddedGrid:
+        # copy rows of an input grid, which are memoryviews into its mapping
+        padded: PaddedGrid = cls(grid.n_rows, grid.n_cols, fill=border, border=border)
+        for y, row in enumerate(grid.rows()):
+            start: int = padded.index(0, y)
+            padded.cells[start:start + grid.n_cols] = row
+        return padded
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(n_rows={self.n_rows}, n_cols={self.n_cols})"
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, i: int) -> int:
+        return self.cells[i]
+
+    def __setitem__(self, i: int, value: int) -> None:
+        self.cells[i] = value
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def coord(self, i: int) -> tuple[int, int]:
+        y, x = divmod(i, self.stride)
+        return (x - 1, y - 1)
+
+    def indices(self) -> Iterator[int]:
+        # flat indices of all inner cells, row by row
+        for y in range(self.n_rows):
+            start: int = self.index(0, y)
+            yield from range(start, start + self.n_cols)
+
+    def row(self, y: int) -> memoryview:
+        start: int = self.index(0, y)
+        return memoryview(self.cells)[start:start + self.n_cols]
+
+    def rows(self) -> Iterator[memoryview]:
+        for y in range(self.n_rows):
+            yield self.row(y)
+
+    def chars(self) -> str:
+        # all cells including the border as a string, which is cheaper to index than bytes when
+        # characters rather than integers are compared
+        return self.cells.decode("latin-1")
+
+    def find(self, value: bytes) -> int:
+        # flat index of the first occurrence of a value, e.g. a start marker
+        if (i := self.cells.find(value)) < 0:
+            raise ValueError(f"{value!r} not found in grid")
+        return i
+
+    def mask(self, values: bytes) -> bytearray:
+        # flat mask with ones for cells whose value is in values and zeros otherwise, translated in
+        # a single pass over all cells
+        table: bytearray = bytearray(256)
+        for value in values:
+            table[value] = 1
+        return self.cells.translate(table)
+
+    def count(self, values: bytes) -> int:
+        return self.mask(values).count(1)
+
+    def translate(self, table: bytes) -> PaddedGrid:
+        # new grid with all cells, including the border, mapped through a translation table
+        translated: PaddedGrid = self.copy()
+        translated.cells = self.cells.translate(table)
+        translated.border = table[self.border]
+        return translated
+
+    def copy(self) -> PaddedGrid:
+        copied: PaddedGrid = self.__class__.__new__(self.__class__)
+        copied.__dict__.update(self.__dict__)
+        copied.cells = bytearray(self.cells)
+        return copied
+
+    def to_array(self) -> Any:
+        # numpy view on all cells including the border, shaped (n_rows + 2, n_cols + 2), sharing
+        # memory with the grid; numpy is only imported when needed
+        import numpy as np
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.n_rows + 2, self.stride)
@@ -0,0 +1,119 @@
+# coding: utf-8
+
+"""
+Breakdown of the startup time per day, based on the output of "python -X importtime". Each day is
+imported in a fresh interpreter after the runner itself, so that only the imports it adds on top of
+the tooling are attributed to it, together with its heaviest direct dependencies.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import subprocess
+from dataclasses import dataclass, field
+
+from aoc import base_dir
+from aoc.runner import get_module_name
+
+
+# lines look like "import time:       535 |       9732 |         multiprocessing.reduction",
+# with the indentation of the name encoding the nesting depth
+importtime_cre = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+# modules imported before the measured one, as in a run of the runner
+base_modules: list[str] = ["aoc.runner"]
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportTime:
+    module: str
+    # cumulative time of the module itself, including all dependencies it imported first
+    seconds: float = 0.0
+    # direct dependencies ordered by decreasing cumulative time
+    dependencies: list[ImportRecord] = field(default_factory=list)
+    error: str | None = None
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    records: list[ImportRecord] = []
+    for line in output.splitlines():
+        if (m := importtime_cre.match(line)):
+            self_us, cumulative_us, indent, name = m.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def get_subtree(records: list[ImportRecord], module: str) -> tuple[ImportRecord, list[ImportRecord]]:
+    # records are written when an import finishes, so the dependencies of a module are the deeper
+    # records right before it
+    for i in range(len(records) - 1, -1, -1):
+        if records[i].name == module:
+            root: ImportRecord = records[i]
+            j: int = i
+            while j > 0 and records[j - 1].depth > root.depth:
+                j -= 1
+            return root, records[j:i]
+    raise ValueError(f"no import record of {module}")
+
+
+def measure_import(module: str, base: list[str] = base_modules) -> ImportTime:
+    """
+    Imports *module* in a fresh interpreter with "-X importtime" after importing all modules in
+    *base*, and returns its cumulative import time and direct dependencies.
+    """
+    result: ImportTime = ImportTime(module)
+    code: str = "; ".join(f"import {name}" for name in base + [module])
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=base_dir,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        result.error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"
+        return result
+
+    root, subtree = get_subtree(parse_importtime(proc.stderr), module)
+    result.seconds = root.cumulative_us * 1e-6
+    result.dependencies = sorted(
+        (record for record in subtree if record.depth == root.depth + 1),
+        key=lambda record: -record.cumulative_us,
+    )
+    return result
+
+
+def measure_days(days: list[str]) -> dict[str, ImportTime]:
+    # the runner and the daemon client on their own, followed by each day on top of the runner
+    times: dict[str, ImportTime] = {
+        "aoc.runner": measure_import("aoc.runner", base=[]),
+        "aoc.client": measure_import("aoc.client", base=[]),
+    }
+    for day in days:
+        times[day] = measure_import(get_module_name(day))
+    return times
+
+
+def format_import_times(
+    times: dict[str, ImportTime],
+    budget: float | None = None,
+    n_deps: int = 3,
+) -> str:
+    w: int = max([14] + [len(name) + 2 for name in times])
+    lines: list[str] = [f"{'module':<{w}}{'import':>12}   heaviest direct imports", "-" * (w + 60)]
+    for name, t in times.items():
+        if t.error:
+            lines.append(f"{name:<{w}}{'-':>12}   failed: {t.error}")
+            continue
+        deps: str = ", ".join(f"{dep.name} {dep.cumulative_us / 1000:.1f}ms" for dep in t.dependencies[:n_deps])
+        flag: str = "  (over budget)" if budget is not None and t.seconds > budget else ""
+        lines.append(f"{name:<{w}}{t.seconds * 1000:>10.1f}ms   {deps}{flag}")
+    return "\n".join(lines)
@@ -0,0 +1,215 @@
+# coding: utf-8
+
+"""
+Lightweight instrumentation of the phases of a day, such as parsing and solving both parts, of
+sub-spans within them, and of named counters in hot loops. Spans and counters are recorded in a
+global registry per process and only when enabled via AOC_INSTRUMENT=1 (or "python -m aoc
+--phases"), otherwise all markers are no-ops.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import contextlib
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, TypeVar
+
+
+T = TypeVar("T")
+
+enabled: bool = os.getenv("AOC_INSTRUMENT", "0").lower() in ("1", "true", "yes", "json")
+
+
+@dataclass
+class Record:
+    count: int = 0
+    seconds: float = 0.0
+
+
+# recorded spans by their path, e.g. "part2/cycle" for a span opened within the part2 phase
+records: dict[str, Record] = {}
+
+# counters by their path, nested the same way as spans
+counters: dict[str, int] = {}
+
+# paths of currently open spans, innermost last
+_stack: list[str] = []
+
+# path and start time of the currently open phase
+_phase: tuple[str, float] | None = None
+
+
+def enable(flag: bool = True) -> None:
+    # also set the environment variable so that the setting is inherited by worker processes
+    global enabled
+    enabled = flag
+    os.environ["AOC_INSTRUMENT"] = "1" if flag else "0"
+
+
+def _record(path: str, seconds: float) -> None:
+    if (record := records.get(path)) is None:
+        record = records[path] = Record()
+    record.count += 1
+    record.seconds += seconds
+
+
+class _Span:
+
+    __slots__ = ("name", "path", "t0")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> _Span:
+        self.path = f"{_stack[-1]}/{self.name}" if _stack else self.name
+        _stack.append(self.path)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        _record(self.path, time.perf_counter() - self.t0)
+        _stack.pop()
+
+
+_null_span = contextlib.nullcontext()
+
+
+def span(name: str) -> contextlib.AbstractContextManager:
+    """
+    Context manager that records the time spent in its body under *name*, nested below the
+    currently open span or phase.
+    """
+    return _Span(name) if enabled else _null_span
+
+
+def timed(name: str | None = None) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator that records each call of the decorated function as a span, named after the function
+    by default. Functions decorated while instrumentation is disabled are returned unchanged.
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if not enabled:
+            return func
+
+        span_name: str = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            with _Span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def phase(name: str) -> None:
+    """
+    Marks the start of a top-level phase such as "parse", "part1" or "part2", which implicitly
+    ends the previous phase. The last phase is ended by :py:func:`end_phase`.
+    """
+    global _phase
+    if not enabled:
+        return
+    end_phase()
+    _stack.append(name)
+    _phase = (name, time.perf_counter())
+
+
+def end_phase() -> None:
+    global _phase
+    if _phase is None:
+        return
+    name, t0 = _phase
+    _record(name, time.perf_counter() - t0)
+    # spans left open by exceptions are discarded along with the phase
+    del _stack[_stack.index(name):]
+    _phase = None
+
+
+def count(name: str, n: int = 1) -> None:
+    """
+    Increments the counter *name*, nested below the currently open span or phase, by *n*.
+    """
+    if not enabled:
+        return
+    path: str = f"{_stack[-1]}/{name}" if _stack else name
+    counters[path] = counters.get(path, 0) + n
+
+
+def count_cache(name: str, func: Callable) -> None:
+    """
+    Sets counters "<name>.hits" and "<name>.misses", as well as "<name>.evictions" for bounded
+    caches, from the cache statistics of a function decorated with functools.cache,
+    lru_cache or aoc.memo.memoize, also when it is wrapped by other decorators. The statistics are
+    cumulative, so this should be called once after the function is no longer used.
+    """
+    if not enabled:
+        return
+    while not hasattr(func, "cache_info"):
+        func = func.__wrapped__
+    info = func.cache_info()
+    path: str = f"{_stack[-1]}/{name}" if _stack else name
+    counters[f"{path}.hits"] = info.hits
+    counters[f"{path}.misses"] = info.misses
+    if hasattr(info, "evictions"):
+        counters[f"{path}.evictions"] = info.evictions
+    elif info.maxsize is not None:
+        # bounded functools.lru_cache's add one entry per miss, so all others were evicted
+        counters[f"{path}.evictions"] = info.misses - info.currsize
+
+
+def collect() -> dict[str, dict[str, Any]]:
+    # end the open phase and return all records as plain dicts, resetting the registry
+    end_phase()
+    data: dict[str, dict[str, Any]] = {path: asdict(record) for path, record in records.items()}
+    records.clear()
+    _stack.clear()
+    return data
+
+
+def collect_counters() -> dict[str, int]:
+    # return all counters, resetting the registry
+    data: dict[str, int] = dict(counters)
+    counters.clear()
+    return data
+
+
+def format_records(data: dict[str, dict[str, Any]], indent: str = "") -> str:
+    w: int = max([24] + [len(path) + 2 for path in data])
+    lines: list[str] = [f"{indent}{'span':<{w}}{'count':>10}{'time':>12}{'mean':>12}"]
+    for path, record in data.items():
+        mean: float = record["seconds"] / max(record["count"], 1)
+        lines.append(f"{indent}{path:<{w}}{record['count']:>10}{record['seconds']:>11.4f}s{mean:>11.6f}s")
+    return "\n".join(lines)
+
+
+def format_counters(data: dict[str, int], indent: str = "") -> str:
+    w: int = max([24] + [len(path) + 2 for path in data])
+    lines: list[str] = [f"{indent}{'counter':<{w}}{'value':>14}"]
+    for path, value in data.items():
+        lines.append(f"{indent}{path:<{w}}{value:>14}")
+    return "\n".join(lines)
+
+
+@atexit.register
+def _dump() -> None:
+    # when a day is executed as a script, report remaining records on exit, as JSON when
+    # AOC_INSTRUMENT is set to "json"
+    if not enabled:
+        return
+    spans, counts = collect(), collect_counters()
+    if not spans and not counts:
+        return
+    if os.getenv("AOC_INSTRUMENT", "").lower() == "json":
+        print(json.dumps({"spans": spans, "counters": counts}, indent=4), file=sys.stderr)
+        return
+    if spans:
+        print(format_records(spans), file=sys.stderr)
+    if counts:
+        print(format_counters(counts), file=sys.stderr)
@@ -0,0 +1,157 @@
+# coding: utf-8
+
+"""
+Memory-mapped access to puzzle inputs, exposing lines, raw bytes, 2D byte grids and blocks of
+lines separated by blank lines, without first reading whole files into lists of strings, as well
+as line-wise reading of streams such as stdin that cannot be mapped.
+"""
+
+from __future__ import annotations
+
+import os
+import mmap
+from typing import BinaryIO, Iterator
+
+
+# bytes considered whitespace when stripping lines, same as bytes.strip()
+whitespace: bytes = b" \t\r\n\x0b\x0c"
+
+
+def iter_stream_lines(f: BinaryIO, skip_empty: bool = True) -> Iterator[str]:
+    # yield stripped and decoded lines of a binary stream such as sys.stdin.buffer, reading one
+    # buffered line at a time so that memory does not grow with the size of the input
+    for line in f:
+        line = line.strip(whitespace)
+        if line or not skip_empty:
+            yield str(line, "utf-8")
+
+
+class Grid:
+    """
+    Read-only view on the bytes of a rectangular input, indexed by (x, y) with zero-based coordinates.
+    Rows are memoryview slices of the underlying buffer, so no data is copied.
+    """
+
+    def __init__(self, buf: memoryview, n_rows: int, n_cols: int, stride: int) -> None:
+        self.buf = buf
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.stride = stride
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(n_rows={self.n_rows}, n_cols={self.n_cols})"
+
+    def __getitem__(self, coord: tuple[int, int]) -> int:
+        x, y = coord
+        if not (0 <= x < self.n_cols and 0 <= y < self.n_rows):
+            raise IndexError(f"coordinate {coord} out of bounds")
+        return self.buf[y * self.stride + x]
+
+    def row(self, y: int) -> memoryview:
+        return self.buf[y * self.stride:y * self.stride + self.n_cols]
+
+    def rows(self) -> Iterator[memoryview]:
+        for y in range(self.n_rows):
+            yield self.row(y)
+
+    def find(self, value: bytes) -> tuple[int, int]:
+        # coordinate of the first occurrence of a value, e.g. a start marker
+        for y, row in enumerate(self.rows()):
+            if (x := bytes(row).find(value)) >= 0:
+                return (x, y)
+        raise ValueError(f"{value!r} not found in grid")
+
+
+class Input:
+    """
+    Memory-mapped input file. Lines, grids and blocks are produced lazily from the mapping, and
+    lines are only decoded one at a time when strings are requested.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # empty files cannot be mapped
+        self._mm: mmap.mmap | None = None
+        if os.path.getsize(path):
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    @property
+    def raw(self) -> memoryview:
+        return memoryview(self._mm if self._mm is not None else b"")
+
+    def iter_raw_lines(self, skip_empty: bool = True, start: int = 0, end: int | None = None) -> Iterator[memoryview]:
+        # yield stripped lines as views into the mapping, optionally only of the lines starting
+        # within the byte range [start, end), e.g. of a chunk
+        buf: memoryview = self.raw
+        size: int = len(buf) if end is None else end
+        while start < size:
+            stop: int = self._mm.find(b"\n", start)
+            if stop < 0:
+                stop = len(buf)
+            # strip
+            i, j = start, stop
+            while i < j and buf[i] in whitespace:
+                i += 1
+            while j > i and buf[j - 1] in whitespace:
+                j -= 1
+            if i < j or not skip_empty:
+                yield buf[i:j]
+            start = stop + 1
+
+    def chunks(self, n_chunks: int) -> list[tuple[int, int]]:
+        """
+        Splits the mapping into at most *n_chunks* byte ranges of similar size that each end right
+        after a newline, or at the end of the file, so that no line is split across chunks.
+        """
+        if self._mm is None:
+            return []
+        size: int = len(self._mm)
+        bounds: list[int] = [0]
+        for k in range(1, n_chunks):
+            if (pos := self._mm.find(b"\n", max(size * k // n_chunks, bounds[-1]))) < 0:
+                break
+            bounds.append(pos + 1)
+        if bounds[-1] < size:
+            bounds.append(size)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def iter_lines(self, skip_empty: bool = True) -> Iterator[str]:
+        for line in self.iter_raw_lines(skip_empty=skip_empty):
+            yield str(line, "utf-8")
+
+    def lines(self, skip_empty: bool = True) -> list[str]:
+        return list(self.iter_lines(skip_empty=skip_empty))
+
+    def blocks(self) -> list[list[str]]:
+        # group lines into blocks separated by one or more blank lines
+        blocks: list[list[str]] = [[]]
+        for line in self.iter_lines(skip_empty=False):
+            if line:
+                blocks[-1].append(line)
+            elif blocks[-1]:
+                blocks.append([])
+        return blocks if blocks[-1] else blocks[:-1]
+
+    def grid(self) -> Grid:
+        # determine the row length and the line separator from the first line
+        buf: memoryview = self.raw
+        if (n_cols := self._mm.find(b"\n") if self._mm is not None else -1) < 0:
+            return Grid(buf, int(len(buf) > 0), len(buf), len(buf))
+        stride: int = n_cols + 1
+        if n_cols and buf[n_cols - 1] == ord("\r"):
+            n_cols -= 1
+        # ignore trailing whitespace, then each row must be followed by the separator
+        end: int = len(buf)
+        while end > 0 and buf[end - 1] in whitespace:
+            end -= 1
+        n_rows: int = (end + stride - n_cols) // stride
+        if n_rows * stride - (stride - n_cols) != end or any(
+            buf[y * stride + n_cols] not in whitespace
+            for y in range(n_rows - 1)
+        ):
+            raise ValueError(f"{self.path} does not contain a rectangular grid")
+        return Grid(buf, n_rows, n_cols, stride)
@@ -0,0 +1,126 @@
+# coding: utf-8
+
+"""
+Bounded memoization with least recently used eviction, as a replacement for functools.cache
+whose entries are never evicted. Caches are limited in their number of entries, default_maxsize
+unless sized per call site, and, when a byte budget is set, in an estimate of the bytes they hold,
+and keep hit, miss and eviction statistics that can be exported as counters via
+aoc.instrument.count_cache. Caches without byte budget or custom key are plain
+functools.lru_cache's, so that hot memoized helpers keep the speed of the C implementation.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import functools
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+# number of entries per cache when not set explicitly
+default_maxsize: int = 1024
+
+
+def get_default_max_bytes() -> int | None:
+    # byte budget per cache, only enabled through the environment as estimating the size of every
+    # new entry is costly compared to the memoized calls themselves
+    max_mb: str | None = os.getenv("AOC_MEMO_MB")
+    return None if not max_mb else int(float(max_mb) * 1024**2)
+
+
+@dataclass
+class MemoInfo:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    n_bytes: int = 0
+    maxsize: int | None = None
+    max_bytes: int | None = None
+
+
+def estimate_size(obj: Any) -> int:
+    # shallow size plus the shallow sizes of items of flat containers, which covers the typical
+    # keys and values such as tuples of strings or sets of numbers
+    size: int = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(map(sys.getsizeof, obj))
+    return size
+
+
+def make_key(args: tuple, kwargs: dict[str, Any]) -> Hashable:
+    return (args, frozenset(kwargs.items())) if kwargs else args
+
+
+def memoize(
+    maxsize: int | None = default_maxsize,
+    max_bytes: int | None = None,
+    key: Callable[..., Hashable] | None = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator that caches results of the decorated function by its arguments, evicting least
+    recently used entries once there are more than *maxsize* entries, default_maxsize by default
+    and unbounded when None, or their estimated size exceeds *max_bytes*, which defaults to
+    AOC_MEMO_MB MB if set, and is unbounded otherwise.
+    *key* can be a function that receives the same arguments and returns a normalized, hashable
+    key, for instance to share entries between equivalent arguments.
+
+    Without byte budget and custom key, the function is wrapped by functools.lru_cache. Otherwise,
+    sizes are only estimated when entries are added. In both cases, the decorated function provides
+    ``cache_info()`` and ``cache_clear()`` like functools.cache.
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        byte_budget: int | None = get_default_max_bytes() if max_bytes is None else max_bytes
+        if byte_budget is None and key is None:
+            return functools.lru_cache(maxsize=maxsize)(func)
+
+        entries: OrderedDict[Hashable, tuple[T, int]] = OrderedDict()
+        info: MemoInfo = MemoInfo(maxsize=maxsize, max_bytes=byte_budget)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            k: Hashable = key(*args, **kwargs) if key else make_key(args, kwargs)
+            if (entry := entries.get(k)) is not None:
+                info.hits += 1
+                entries.move_to_end(k)
+                return entry[0]
+
+            info.misses += 1
+            value: T = func(*args, **kwargs)
+
+            # the entry might have been added by a recursive call in the meantime
+            if k in entries:
+                entries.move_to_end(k)
+                return value
+            n_bytes: int = 0 if info.max_bytes is None else estimate_size(k) + estimate_size(value)
+            entries[k] = (value, n_bytes)
+            info.n_bytes += n_bytes
+
+            # evict least recently used entries, but always keep the new one
+            while len(entries) > 1 and (
+                (info.maxsize is not None and len(entries) > info.maxsize) or
+                (info.max_bytes is not None and info.n_bytes > info.max_bytes)
+            ):
+                info.n_bytes -= entries.popitem(last=False)[1][1]
+                info.evictions += 1
+            info.size = len(entries)
+
+            return value
+
+        def cache_info() -> MemoInfo:
+            return info
+
+        def cache_clear() -> None:
+            entries.clear()
+            info.hits = info.misses = info.evictions = info.size = info.n_bytes = 0
+
+        wrapper.cache_info = cache_info  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+
+        return wrapper
+
+    return decorator
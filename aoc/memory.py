@@ -0,0 +1,161 @@
+# coding: utf-8
+
+"""
+Memory tracing of code blocks with tracemalloc, measuring the peak and retained memory as well as
+the allocation sites that hold most memory close to the peak.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import linecache
+import contextlib
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from aoc import base_dir
+
+
+@dataclass
+class MemoryUsage:
+    # bytes allocated on top of what was allocated when tracing started
+    peak_bytes: int = 0
+    retained_bytes: int = 0
+    # (location, bytes, number of blocks) of the largest allocation sites
+    top_sites: list[tuple[str, int, int]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "peak_bytes": self.peak_bytes,
+            "retained_bytes": self.retained_bytes,
+            "top_sites": [list(site) for site in self.top_sites],
+        }
+
+
+# allocations of the tracing machinery itself are not of interest
+_filters: list[tracemalloc.Filter] = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_filters)
+
+
+def _format_location(frame: tracemalloc.Frame) -> str:
+    # paths relative to the repository where possible
+    path: str = frame.filename
+    if path.startswith(base_dir + os.sep):
+        path = os.path.relpath(path, base_dir)
+    return f"{path}:{frame.lineno}"
+
+
+def _get_top_sites(
+    snapshot: tracemalloc.Snapshot,
+    base_snapshot: tracemalloc.Snapshot,
+    n_sites: int,
+) -> list[tuple[str, int, int]]:
+    return [
+        (_format_location(stat.traceback[0]), stat.size_diff, stat.count_diff)
+        for stat in snapshot.compare_to(base_snapshot, "lineno")
+        if stat.size_diff > 0
+    ][:n_sites]
+
+
+class _Sampler(threading.Thread):
+    """
+    Thread that polls the traced memory and determines the top allocation sites each time it grew
+    by more than *growth* relative to the last sample, so that the last sample is taken close to
+    the peak while the number of (expensive) snapshots stays logarithmic in the peak. Snapshots are
+    themselves traced, so they are reduced to the top sites right away and the peak is reset
+    afterwards, keeping track of the actual peak separately.
+    """
+
+    def __init__(
+        self,
+        base_snapshot: tracemalloc.Snapshot,
+        offset: int,
+        n_sites: int,
+        interval: float = 0.01,
+        growth: float = 0.1,
+    ) -> None:
+        super().__init__(daemon=True)
+        self.base_snapshot = base_snapshot
+        self.offset = offset
+        self.n_sites = n_sites
+        self.interval = interval
+        self.growth = growth
+        self.top_sites: list[tuple[str, int, int]] | None = None
+        self.sampled_bytes: int = 0
+        self.peak: int = 0
+        self.stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            current, peak = tracemalloc.get_traced_memory()
+            if current - self.offset <= self.sampled_bytes * (1 + self.growth):
+                continue
+            self.peak = max(self.peak, peak)
+            self.top_sites = _get_top_sites(_take_snapshot(), self.base_snapshot, self.n_sites)
+            self.sampled_bytes = current - self.offset
+            tracemalloc.reset_peak()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        self.join()
+
+
+@contextlib.contextmanager
+def trace_memory(n_sites: int = 5, interval: float = 0.01) -> Iterator[MemoryUsage]:
+    """
+    Context manager that traces allocations within its body and fills the yielded
+    :py:class:`MemoryUsage` on exit. Top sites refer to the memory allocated within the body and
+    still alive at the last sample, which is taken by a sampling thread close to the peak, or at
+    the end of the block for blocks that are too short to be sampled.
+    """
+    usage: MemoryUsage = MemoryUsage()
+
+    # start tracing unless already done by an outer block
+    started: bool = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    base_snapshot: tracemalloc.Snapshot = _take_snapshot()
+    offset: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+
+    sampler: _Sampler = _Sampler(base_snapshot, offset, n_sites, interval=interval)
+    sampler.start()
+    try:
+        yield usage
+    finally:
+        sampler.stop()
+        current, peak = tracemalloc.get_traced_memory()
+        usage.peak_bytes = max(max(peak, sampler.peak) - offset, 0)
+        usage.retained_bytes = max(current - offset, 0)
+        if sampler.top_sites is not None:
+            usage.top_sites = sampler.top_sites
+        else:
+            usage.top_sites = _get_top_sites(_take_snapshot(), base_snapshot, n_sites)
+        if started:
+            tracemalloc.stop()
+
+
+def format_sites(usage: MemoryUsage, indent: str = "") -> str:
+    return "\n".join(
+        f"{indent}{size / 1024**2:>9.2f} MB {count:>10} blocks  {location}"
+        for location, size, count in usage.top_sites
+    )
+
+
+def format_usage(usage: MemoryUsage, indent: str = "") -> str:
+    lines: list[str] = [
+        f"{indent}peak {usage.peak_bytes / 1024**2:.2f} MB, retained {usage.retained_bytes / 1024**2:.2f} MB",
+    ]
+    if usage.top_sites:
+        lines.append(format_sites(usage, indent=indent + "  "))
+    return "\n".join(lines)
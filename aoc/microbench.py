@@ -0,0 +1,182 @@
+# coding: utf-8
+
+"""
+Microbenchmark of the data models that days parse their inputs into, comparing the slotted and
+mostly frozen classes with precomputed fields to twins of the same classes whose instances have a
+per-instance __dict__, in terms of memory per instance, construction time, and the time to access
+derived values that used to be recomputed by properties on every access.
+Run from the repository root via "python -m aoc.microbench [-n 100000]".
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import types
+import random
+import argparse
+import tracemalloc
+from operator import lt
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from aoc.runner import load_day
+
+
+@dataclass
+class Case:
+    day: str
+    model: str
+    # arguments of a random instance
+    make_args: Callable[[random.Random, int], tuple]
+    # name of a precomputed field and the function that computes it from an instance otherwise
+    derived: str | None = None
+    recompute: Callable[[Any], Any] | None = None
+
+
+def _hand_score(hand: Any) -> int:
+    score_cls = load_day("day7").Score
+    return score_cls.get(len(set(hand.cards)), max(Counter(hand.cards).values()))
+
+
+cases: list[Case] = [
+    Case("day3", "Part", lambda rng, i: (str(rng.randrange(1000)).encode(), i, rng.randrange(140))),
+    Case("day3", "Symbol", lambda rng, i: (b"*", i, rng.randrange(140))),
+    Case("day4", "Card", lambda rng, i: (i, tuple(rng.sample(range(100), 10)), tuple(rng.sample(range(100), 25)), 3)),
+    Case(
+        "day5",
+        "Mapping",
+        lambda rng, i: (rng.randrange(2**32), rng.randrange(2**32), rng.randrange(2**28)),
+        derived="src_end",
+        recompute=lambda m: m.src_start + m.n,
+    ),
+    Case("day5", "Range", lambda rng, i: (rng.randrange(2**32), rng.randrange(2**28))),
+    Case("day6", "Game", lambda rng, i: (rng.randrange(100), rng.randrange(2000))),
+    Case(
+        "day7",
+        "Hand",
+        lambda rng, i: ("".join(rng.choices("23456789TJQKA", k=5)), rng.randrange(1000)),
+        derived="score",
+        recompute=_hand_score,
+    ),
+    Case("day8", "Node", lambda rng, i: (f"{i:03d}",)),
+    Case("day13", "Pattern", lambda rng, i: (["".join(rng.choices(".#", k=15)) for _ in range(15)],)),
+    Case("day18", "Instruction", lambda rng, i: (rng.choice("RDLU"), rng.randrange(1, 10))),
+    Case("day18", "Point", lambda rng, i: (rng.randrange(-500, 500), rng.randrange(-500, 500))),
+    Case(
+        "day19",
+        "Part",
+        lambda rng, i: ({attr: rng.randrange(1, 4001) for attr in "xmas"},),
+        derived="sum_ratings",
+        recompute=lambda part: sum(part.ratings.values()),
+    ),
+    Case("day19", "Condition", lambda rng, i: (rng.choice("xmas"), lt, rng.randrange(1, 4001), True)),
+    Case("day20", "Counter", lambda rng, i: (rng.randrange(100), rng.randrange(100))),
+]
+
+
+def dict_twin(cls: type) -> type:
+    # same fields and methods, but instances have a __dict__ instead of slots
+    ns: dict[str, Any] = {
+        name: value
+        for name, value in cls.__dict__.items()
+        if name not in ("__slots__", "__weakref__", "__getstate__", "__setstate__") and
+        not isinstance(value, types.MemberDescriptorType)
+    }
+    return type(cls.__name__, cls.__bases__, ns)
+
+
+def measure_memory(cls: type, args_list: list[tuple]) -> float:
+    # retained bytes per instance, including precomputed fields and the list holding them, which is
+    # the same for both variants, read from plain tracemalloc counters as no allocation sites are
+    # needed and snapshots would dominate the runtime
+    tracemalloc.start()
+    try:
+        offset: int = tracemalloc.get_traced_memory()[0]
+        objs: list[Any] = [cls(*args) for args in args_list]
+        n_bytes: int = tracemalloc.get_traced_memory()[0] - offset
+    finally:
+        tracemalloc.stop()
+    del objs
+    return n_bytes / len(args_list)
+
+
+def measure_time(func: Callable[[], Any], n: int, repeat: int) -> float:
+    # best time per item in seconds
+    best: float = float("inf")
+    for _ in range(repeat):
+        t0: float = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best / n
+
+
+def run_case(case: Case, n: int = 100_000, repeat: int = 3, seed: int = 0) -> dict[str, Any]:
+    cls: type = getattr(load_day(case.day), case.model)
+    twin: type = dict_twin(cls)
+    rng: random.Random = random.Random(f"{case.day}:{case.model}:{seed}")
+    args_list: list[tuple] = [case.make_args(rng, i) for i in range(n)]
+
+    result: dict[str, Any] = {
+        "day": case.day,
+        "model": case.model,
+        "bytes_dict": measure_memory(twin, args_list),
+        "bytes_slots": measure_memory(cls, args_list),
+        "init_dict": measure_time(lambda: [twin(*args) for args in args_list], n, repeat),
+        "init_slots": measure_time(lambda: [cls(*args) for args in args_list], n, repeat),
+    }
+
+    # access of derived values, recomputed each time as before, compared to precomputed fields
+    if case.derived and case.recompute:
+        objs: list[Any] = [cls(*args) for args in args_list]
+        recompute: Callable[[Any], Any] = case.recompute
+        attr: str = case.derived
+        result["derived"] = attr
+        result["derived_recomputed"] = measure_time(lambda: [recompute(obj) for obj in objs], n, repeat)
+        result["derived_precomputed"] = measure_time(lambda: [getattr(obj, attr) for obj in objs], n, repeat)
+
+    return result
+
+
+def format_results(results: list[dict[str, Any]]) -> str:
+    header: str = (
+        f"{'day':<7}{'model':<13}{'bytes dict':>12}{'bytes slots':>13}{'saved':>8}{'init dict':>12}"
+        f"{'init slots':>12}   derived value (recomputed -> precomputed)"
+    )
+    lines: list[str] = [header, "-" * len(header)]
+    for r in results:
+        saved: float = 100.0 * (1.0 - r["bytes_slots"] / r["bytes_dict"])
+        line: str = (
+            f"{r['day']:<7}{r['model']:<13}{r['bytes_dict']:>12.1f}{r['bytes_slots']:>13.1f}{saved:>7.1f}%"
+            f"{r['init_dict'] * 1e9:>10.0f}ns{r['init_slots'] * 1e9:>10.0f}ns"
+        )
+        if "derived" in r:
+            line += (
+                f"   {r['derived']}: {r['derived_recomputed'] * 1e9:.0f}ns -> "
+                f"{r['derived_precomputed'] * 1e9:.0f}ns"
+            )
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.microbench", description=__doc__.strip())
+    parser.add_argument("days", nargs="*", help="only benchmark models of these days, e.g. '7' or 'day7'")
+    parser.add_argument("-n", type=int, default=100_000, help="number of instances, default: %(default)s")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="number of timed runs, default: %(default)s")
+    args = parser.parse_args()
+
+    days: set[str] = {day if day.startswith("day") else f"day{day}" for day in args.days}
+    results: list[dict[str, Any]] = [
+        run_case(case, n=args.n, repeat=args.repeat)
+        for case in cases
+        if not days or case.day in days
+    ]
+    print(format_results(results))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# coding: utf-8
+
+"""
+Profiling of single main() invocations, or of solving a single part for days that separate
+parsing from solving, writing cProfile statistics to a .prof file as well as
+sampled call stacks in the collapsed format read by flamegraph tools such as flamegraph.pl,
+speedscope or inferno.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import signal
+import pstats
+import cProfile
+import contextlib
+from collections import Counter
+from types import FrameType
+from typing import Any, Callable
+
+from aoc import base_dir
+from aoc.runner import load_day, has_parts, get_data_path
+
+
+profiles_dir: str = os.path.join(base_dir, ".aoc", "profiles")
+
+
+def get_invocation(day: str, part: int | None = None) -> tuple[Callable[..., Any], tuple[Any, ...]]:
+    # function and arguments to profile, which is the solver of a part with its input parsed
+    # beforehand, or main() for days that solve both parts at once or when no part is selected
+    mod = load_day(day)
+    if part is None:
+        return mod.main, ()
+    if not has_parts(mod):
+        raise ValueError(f"{day} solves both parts in main() at once, cannot select part {part}")
+    if part not in (1, 2):
+        raise ValueError(f"{day} has parts 1 and 2, cannot select part {part}")
+    return getattr(mod, f"solve_part{part}"), (mod.parse(get_data_path(day)),)
+
+
+def _frame_label(frame: FrameType) -> str:
+    path: str = frame.f_code.co_filename
+    if path.startswith(base_dir + os.sep):
+        path = os.path.relpath(path, base_dir)
+    return f"{frame.f_code.co_name} ({path}:{frame.f_code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Statistical profiler that samples the call stack of the main thread on SIGPROF, i.e., every
+    *interval* seconds of consumed cpu time, counting stacks below the frame of :py:meth:`run`.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+
+    def _handler(self, signum: int, frame: FrameType | None) -> None:
+        stack: list[str] = []
+        while frame is not None and frame.f_code is not self.run.__code__:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        prev_handler = signal.signal(signal.SIGPROF, self._handler)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, prev_handler)
+
+    def write_collapsed(self, path: str) -> None:
+        # one line per unique stack, root first and separated by semicolons, followed by the count
+        with open(path, "w") as f:
+            for stack, n in sorted(self.stacks.items()):
+                f.write(f"{';'.join(stack)} {n}\n")
+
+
+def profile_day(
+    day: str,
+    part: int | None = None,
+    out_dir: str = profiles_dir,
+    interval: float = 0.001,
+) -> tuple[str, str]:
+    """
+    Profiles the main() invocation of *day*, or solving only *part* with the input parsed beforehand,
+    and returns the paths of the written .prof and collapsed stack files.
+    """
+    func, args = get_invocation(day, part)
+
+    # run with cProfile first, then separately with the sampler so that neither of them shows up
+    # in the results of the other, and without printing the output twice
+    profiler: cProfile.Profile = cProfile.Profile()
+    profiler.runcall(func, *args)
+    sampler: StackSampler = StackSampler(interval=interval)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sampler.run(func, *args)
+
+    # write outputs
+    os.makedirs(out_dir, exist_ok=True)
+    name: str = day if part is None else f"{day}_part{part}"
+    prof_path: str = os.path.join(out_dir, f"{name}.prof")
+    collapsed_path: str = os.path.join(out_dir, f"{name}.collapsed")
+    profiler.dump_stats(prof_path)
+    sampler.write_collapsed(collapsed_path)
+
+    return prof_path, collapsed_path
+
+
+def print_stats(prof_path: str, n: int = 20, sort: str = "cumulative") -> None:
+    stats: pstats.Stats = pstats.Stats(prof_path, stream=sys.stdout)
+    stats.strip_dirs().sort_stats(sort).print_stats(n)
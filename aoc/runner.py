@@ -0,0 +1,338 @@
+# coding: utf-8
+
+"""
+Discovery of all dayN/code.py modules and timed invocation of their main() functions, either
+sequentially or fanned out over a process pool. Days that separate parsing from solving are
+parsed once and both parts are solved in-process from the same parsed input.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+import glob
+import json
+import time
+import signal
+import importlib
+import traceback
+import contextlib
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from aoc import base_dir, instrument
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from aoc.memory import MemoryUsage
+
+
+# file in which the last measured duration per day is stored, used to schedule longest days first
+durations_file: str = os.path.join(base_dir, ".aoc", "durations.json")
+
+
+@dataclass
+class Timing:
+    label: str
+    seconds: float
+    # recorded phases, spans and counters when instrumentation is enabled
+    spans: dict[str, dict[str, Any]] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    # traced memory usage when requested
+    memory: MemoryUsage | None = None
+
+
+@dataclass
+class DayResult:
+    day: str
+    timings: list[Timing] = field(default_factory=list)
+    output: str = ""
+    error: str | None = None
+    timed_out: bool = False
+
+    @property
+    def seconds(self) -> float:
+        return sum(timing.seconds for timing in self.timings)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out
+
+    @property
+    def status(self) -> str:
+        return "timeout" if self.timed_out else ("failed" if self.error else "ok")
+
+
+class DayTimeout(Exception):
+    pass
+
+
+def day_number(day: str) -> int:
+    return int(re.match(r"^day(\d+)", day).group(1))
+
+
+def discover_days(variants: bool = False) -> list[str]:
+    # find all day directories that contain a code.py, ordered by day number, and optionally
+    # alternative solutions such as day5/code_bruteforce.py, named "day5_bruteforce"
+    days: list[str] = []
+    for path in glob.glob(os.path.join(base_dir, "day*", "code*.py")):
+        day: str = os.path.basename(os.path.dirname(path))
+        name: str = os.path.splitext(os.path.basename(path))[0]
+        if name == "code":
+            days.append(day)
+        elif variants:
+            days.append(f"{day}_{name[5:]}")
+    return sorted(days, key=lambda day: (day_number(day), day))
+
+
+def select_days(selection: list[str] | None = None, variants: bool = False) -> list[str]:
+    # no selection means all days, otherwise accept "17" as well as "day17"
+    days: list[str] = discover_days(variants=True)
+    if not selection:
+        return days if variants else [day for day in days if "_" not in day]
+    selected: list[str] = []
+    for s in selection:
+        day = s if s.startswith("day") else f"day{s}"
+        if day not in days:
+            raise ValueError(f"unknown day '{s}', available: {', '.join(days)}")
+        selected.append(day)
+    return selected
+
+
+def get_module_name(day: str) -> str:
+    # "day5" refers to day5/code.py, "day5_bruteforce" to day5/code_bruteforce.py
+    day, _, variant = day.partition("_")
+    return f"{day}.code_{variant}" if variant else f"{day}.code"
+
+
+def load_day(day: str) -> ModuleType:
+    # days are only imported when they are run, so that discovery does not pay for their imports
+    return importlib.import_module(get_module_name(day))
+
+
+def has_parts(mod: ModuleType) -> bool:
+    # days that expose parse(path), solve_part1(parsed) and solve_part2(parsed) besides main()
+    return all(callable(getattr(mod, attr, None)) for attr in ("parse", "solve_part1", "solve_part2"))
+
+
+def get_data_path(day: str) -> str:
+    # variants read the same input as the main solution
+    return os.path.join(base_dir, day.partition("_")[0], "data.txt")
+
+
+@contextlib.contextmanager
+def time_budget(seconds: float | None) -> Iterator[None]:
+    # raise a DayTimeout in the main thread once the budget is exceeded, which works both for
+    # sequential runs and within pool workers as they execute tasks in their main thread
+    if not seconds:
+        yield
+        return
+
+    def handler(signum: int, frame: Any) -> None:
+        raise DayTimeout(f"time budget of {seconds}s exceeded")
+
+    prev_handler = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, prev_handler)
+
+
+def run_day(day: str, budget: float | None = None, memory: bool = False) -> DayResult:
+    result: DayResult = DayResult(day)
+    stdout: io.StringIO = io.StringIO()
+    t_start: float = time.perf_counter()
+    # discard records left over by previous days in the same process
+    instrument.collect()
+    instrument.collect_counters()
+    # tracemalloc and its helpers are only imported when memory is traced
+    trace: Callable[[], contextlib.AbstractContextManager] = contextlib.nullcontext
+    if memory:
+        from aoc.memory import trace_memory
+        trace = trace_memory
+    try:
+        with contextlib.redirect_stdout(stdout), time_budget(budget):
+            # import
+            with trace() as usage:
+                t0: float = time.perf_counter()
+                mod: ModuleType = load_day(day)
+                t: float = time.perf_counter() - t0
+            result.timings.append(Timing("import", t, memory=usage))
+
+            def invoke(label: str, func: Callable[..., Any], *args: Any) -> Any:
+                with trace() as usage:
+                    t0 = time.perf_counter()
+                    value: Any = func(*args)
+                    t = time.perf_counter() - t0
+                result.timings.append(Timing(
+                    label,
+                    t,
+                    spans=instrument.collect(),
+                    counters=instrument.collect_counters(),
+                    memory=usage,
+                ))
+                return value
+
+            if has_parts(mod):
+                # parse once and solve both parts from the same parsed input, marking the phases that
+                # main() would mark itself
+                instrument.phase("parse")
+                parsed: Any = invoke("parse", mod.parse, get_data_path(day))
+                for part in (1, 2):
+                    instrument.phase(f"part{part}")
+                    answer: Any = invoke(f"part{part}", getattr(mod, f"solve_part{part}"), parsed)
+                    print(f"part{part}={answer} (truth={mod.truths[part - 1]})")
+            else:
+                invoke("main", mod.main)
+    except DayTimeout:
+        result.timed_out = True
+        result.timings.append(Timing("timeout", time.perf_counter() - t_start - result.seconds))
+    except Exception:
+        result.error = traceback.format_exc()
+    result.output = stdout.getvalue()
+    return result
+
+
+def load_durations() -> dict[str, float]:
+    if not os.path.exists(durations_file):
+        return {}
+    with open(durations_file, "r") as f:
+        return json.load(f)
+
+
+def save_durations(results: list[DayResult]) -> None:
+    # merge with previous durations so that partial runs do not forget other days, and only store
+    # durations of days that finished, as timeouts and failures say little about their duration
+    durations: dict[str, float] = load_durations()
+    durations.update({result.day: result.seconds for result in results if result.ok})
+    os.makedirs(os.path.dirname(durations_file), exist_ok=True)
+    with open(durations_file, "w") as f:
+        json.dump(durations, f, indent=4, sort_keys=True)
+
+
+def schedule_days(days: list[str]) -> list[str]:
+    # longest days first, based on the last known durations, days without any duration being
+    # considered longest as they might be slow
+    durations: dict[str, float] = load_durations()
+    return sorted(days, key=lambda day: -durations.get(day, float("inf")))
+
+
+def run_days(
+    days: list[str],
+    jobs: int | None = None,
+    budget: float | None = None,
+    memory: bool = False,
+    verbose: bool = True,
+) -> list[DayResult]:
+    results: list[DayResult] = []
+
+    if jobs is None:
+        # sequentially in this process
+        for day in days:
+            results.append(result := run_day(day, budget=budget, memory=memory))
+            if verbose:
+                print(format_output(result))
+    else:
+        # fan out over a process pool, sized to the number of cores by default, importing the
+        # pool only here as multiprocessing takes a large share of the startup time
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+            futures: list[Future] = [pool.submit(run_day, day, budget, memory) for day in schedule_days(days)]
+            for future in as_completed(futures):
+                results.append(result := future.result())
+                if verbose:
+                    print(format_output(result))
+        results.sort(key=lambda result: days.index(result.day))
+
+    save_durations(results)
+
+    return results
+
+
+def format_output(result: DayResult) -> str:
+    lines: list[str] = [f"--- {result.day} ---", result.output.rstrip()]
+    if result.error:
+        lines.append(result.error.rstrip())
+    if result.timed_out:
+        lines.append("timed out")
+    return "\n".join(line for line in lines if line)
+
+
+def format_report(results: list[DayResult], wall_seconds: float | None = None) -> str:
+    # one row per timed invocation, followed by the day total
+    w: int = max([8] + [len(result.day) + 2 for result in results])
+    lines: list[str] = [f"{'day':<{w}}{'invocation':<36}{'time':>12}", "-" * (w + 48)]
+    for result in results:
+        for timing in result.timings:
+            lines.append(f"{result.day:<{w}}{timing.label:<36}{timing.seconds:>11.3f}s")
+        status: str = "total" if result.ok else f"total ({result.status})"
+        lines.append(f"{result.day:<{w}}{status:<36}{result.seconds:>11.3f}s")
+    lines.append("-" * (w + 48))
+    lines.append(f"{'all':<{w}}{'total':<36}{sum(r.seconds for r in results):>11.3f}s")
+    if wall_seconds is not None:
+        lines.append(f"{'all':<{w}}{'wall':<36}{wall_seconds:>11.3f}s")
+    return "\n".join(lines)
+
+
+def format_spans(results: list[DayResult]) -> str:
+    # one row per recorded phase or span of each timed invocation
+    w: int = max([8] + [len(result.day) + 2 for result in results])
+    lines: list[str] = [
+        f"{'day':<{w}}{'invocation':<28}{'span':<24}{'count':>10}{'time':>12}",
+        "-" * (w + 74),
+    ]
+    for result in results:
+        for timing in result.timings:
+            for path, record in timing.spans.items():
+                lines.append(
+                    f"{result.day:<{w}}{timing.label:<28}{path:<24}{record['count']:>10}"
+                    f"{record['seconds']:>11.4f}s",
+                )
+    return "\n".join(lines)
+
+
+def format_counters(results: list[DayResult]) -> str:
+    # one row per counter of each timed invocation
+    w: int = max([8] + [len(result.day) + 2 for result in results])
+    lines: list[str] = [
+        f"{'day':<{w}}{'invocation':<28}{'counter':<36}{'value':>14}",
+        "-" * (w + 78),
+    ]
+    for result in results:
+        for timing in result.timings:
+            for path, value in timing.counters.items():
+                lines.append(f"{result.day:<{w}}{timing.label:<28}{path:<36}{value:>14}")
+    return "\n".join(lines)
+
+
+def format_memory(results: list[DayResult]) -> str:
+    # peak and retained memory per traced invocation, followed by its top allocation sites
+    from aoc.memory import format_sites
+    w: int = max([8] + [len(result.day) + 2 for result in results])
+    lines: list[str] = [f"{'day':<{w}}{'invocation':<36}{'peak MB':>12}{'retained MB':>14}", "-" * (w + 62)]
+    for result in results:
+        for timing in result.timings:
+            if not (usage := timing.memory):
+                continue
+            lines.append(
+                f"{result.day:<{w}}{timing.label:<36}{usage.peak_bytes / 1024**2:>12.2f}"
+                f"{usage.retained_bytes / 1024**2:>14.2f}",
+            )
+            if usage.top_sites:
+                lines.append(format_sites(usage, indent=" " * w))
+    return "\n".join(lines)
+
+
+def instrument_to_dict(results: list[DayResult]) -> dict[str, dict[str, dict[str, Any]]]:
+    return {
+        result.day: {
+            timing.label: {"spans": timing.spans, "counters": timing.counters}
+            for timing in result.timings
+            if timing.spans or timing.counters
+        }
+        for result in results
+    }
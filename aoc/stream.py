@@ -0,0 +1,69 @@
+# coding: utf-8
+
+"""
+Streaming mode for days whose input lines are independent, reading the input line by line from
+stdin or a file and solving both parts in a single pass in constant or bounded memory, so that
+inputs of any size can be piped through without materializing all lines first.
+Run from the repository root via "python -m aoc.stream DAY [PATH]", e.g.
+"cat .aoc/generated/day9/scale1000_seed0.txt | python -m aoc.stream 9".
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+import contextlib
+from types import ModuleType
+from typing import BinaryIO
+
+from aoc.loader import iter_stream_lines
+from aoc.runner import discover_days, select_days, load_day
+
+
+def supports_streaming(mod: ModuleType) -> bool:
+    # days that expose stream(lines) returning the answers of both parts
+    return callable(getattr(mod, "stream", None))
+
+
+def streaming_days() -> list[str]:
+    return [day for day in discover_days() if supports_streaming(load_day(day))]
+
+
+def stream_day(day: str, f: BinaryIO) -> tuple[int, int]:
+    """
+    Solves both parts of *day* by streaming the lines of the binary stream *f*, and returns their
+    answers. A *ValueError* is raised if the day does not support streaming.
+    """
+    mod: ModuleType = load_day(day)
+    if not supports_streaming(mod):
+        raise ValueError(f"{day} does not support streaming, available: {', '.join(streaming_days())}")
+    return mod.stream(iter_stream_lines(f))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.stream", description=__doc__.strip())
+    parser.add_argument("day", help="day to run, e.g. '9' or 'day9'")
+    parser.add_argument("path", nargs="?", default="-", help="input file, default: stdin")
+    args = parser.parse_args()
+
+    try:
+        day: str = select_days([args.day], variants=True)[0]
+    except ValueError as e:
+        parser.error(str(e))
+
+    t0: float = time.perf_counter()
+    with open(args.path, "rb") if args.path != "-" else contextlib.nullcontext(sys.stdin.buffer) as f:
+        try:
+            answers: tuple[int, int] = stream_day(day, f)
+        except ValueError as e:
+            parser.error(str(e))
+    for part, answer in enumerate(answers, 1):
+        print(f"part{part}={answer}")
+    print(f"{day} streamed in {time.perf_counter() - t0:.3f}s", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,14 @@
 # coding: utf-8
 
 import os
-import re
+import sys
+from array import array
+from collections import deque
+from typing import Iterable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
@@ -19,28 +26,177 @@ string_nums: dict[str, str] = {
 }
 
 
-def main(part_two: bool = False) -> None:
-    # read the file
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+def build_automaton(words: dict[bytes, int]) -> tuple[list[list[int]], list[int]]:
+    # aho-corasick automaton of the words as a full transition table per state and byte, and the
+    # value of the word that ends in each state, or -1
+
+    # trie of all words
+    goto: list[dict[int, int]] = [{}]
+    values: list[int] = [-1]
+    for word, value in words.items():
+        state: int = 0
+        for c in word:
+            if c not in goto[state]:
+                goto[state][c] = len(goto)
+                goto.append({})
+                values.append(-1)
+            state = goto[state][c]
+        values[state] = value
+
+    # fill missing transitions from the failure states in breadth-first order, so that the rows of
+    # failure states, which are always less deep, are complete when they are copied
+    delta: list[list[int]] = [[0] * 256 for _ in goto]
+    for c, child in goto[0].items():
+        delta[0][c] = child
+    queue: deque[tuple[int, int]] = deque((child, 0) for child in goto[0].values())
+    while queue:
+        state, fail = queue.popleft()
+        if values[state] < 0:
+            values[state] = values[fail]
+        delta[state] = delta[fail][:]
+        for c, child in goto[state].items():
+            delta[state][c] = child
+            queue.append((child, delta[fail][c]))
+
+    return delta, values
+
+
+# automata for spelled-out numbers, reading lines forward and backward, where the first match
+# backward is the last one forward since no number is contained in another one
+forward_delta, forward_values = build_automaton({
+    word.encode(): int(num)
+    for word, num in string_nums.items()
+})
+backward_delta, backward_values = build_automaton({
+    word[::-1].encode(): int(num)
+    for word, num in string_nums.items()
+})
+
+
+# minimum size of chunks in bytes that are scanned in parallel
+min_chunk_size: int = 64 * 1024**2
+
+# answers of the actual input
+truths: tuple[int, int] = (54953, 53868)
+
+
+def get_values(line: bytes) -> tuple[int, int]:
+    # values of both parts, combining the first and last digit, also spelled out ones in part 2,
+    # by scanning from both ends and stopping at the first digit, which ends the search for spelled
+    # out numbers as well, or otherwise scanning the full line, with -1 for parts without any match
+    first1: int = -1
+    first2: int = -1
+    state: int = 0
+    for c in line:
+        if 48 <= c <= 57:
+            first1 = c - 48
+            break
+        if first2 < 0:
+            state = forward_delta[state][c]
+            first2 = forward_values[state]
+
+    last1: int = -1
+    last2: int = -1
+    state = 0
+    for c in reversed(line):
+        if 48 <= c <= 57:
+            last1 = c - 48
+            break
+        if last2 < 0:
+            state = backward_delta[state][c]
+            last2 = backward_values[state]
+
+    # spelled out numbers only count when they come before the first or after the last digit
+    if first1 >= 0:
+        first2 = first1 if first2 < 0 else first2
+        last2 = last1 if last2 < 0 else last2
+
+    return (
+        -1 if first1 < 0 else 10 * first1 + last1,
+        -1 if first2 < 0 else 10 * first2 + last2,
+    )
+
+
+def parse_chunk(path: str, start: int = 0, end: int | None = None) -> tuple[array, array]:
+    # values of both parts per line in a single pass over the raw bytes of a chunk of the file, as
+    # signed bytes to store -1 for lines without values
+    values1: array = array("b")
+    values2: array = array("b")
+    for line in Input(path).iter_raw_lines(start=start, end=end):
+        value1, value2 = get_values(line)
+        values1.append(value1)
+        values2.append(value2)
+    return values1, values2
 
-    # sum values
-    sum_nums: int = 0
+
+def parse(path: str, jobs: int | None = None) -> tuple[array, array]:
+    # values of both parts per line, scanning large files in newline-aligned chunks in a process
+    # pool, where each worker maps the file on its own so that only offsets and values are sent
+    inp: Input = Input(path)
+    n_chunks: int = min(jobs or os.cpu_count() or 1, len(inp.raw) // min_chunk_size)
+    if n_chunks < 2:
+        return parse_chunk(path)
+
+    from concurrent.futures import ProcessPoolExecutor
+    values1: array = array("b")
+    values2: array = array("b")
+    starts, ends = zip(*inp.chunks(n_chunks))
+    with ProcessPoolExecutor(max_workers=n_chunks) as pool:
+        for chunk_values1, chunk_values2 in pool.map(parse_chunk, [path] * len(starts), starts, ends):
+            values1 += chunk_values1
+            values2 += chunk_values2
+    return values1, values2
+
+
+def stream(lines: Iterable[str]) -> tuple[int | None, int | None]:
+    # solve both parts in a single pass over lines in constant memory, with None for a part that is
+    # undefined as a line contains no value for it, such as lines without digits in part 1
+    sum_nums1: int | None = 0
+    sum_nums2: int | None = 0
     for line in lines:
-        if not part_two:
-            nums = re.findall(r"(?=(\d))", line)
-        else:
-            nums = [
-                string_nums.get(num, num)
-                for num in re.findall(rf"(?=(\d|{'|'.join(string_nums)}))", line)
-            ]
-        num = f"{nums[0]}{nums[-1]}"
-        sum_nums += int(num)
+        value1, value2 = get_values(line.encode("utf-8"))
+        sum_nums1 = None if sum_nums1 is None or value1 < 0 else sum_nums1 + value1
+        sum_nums2 = None if sum_nums2 is None or value2 < 0 else sum_nums2 + value2
+    return sum_nums1, sum_nums2
+
+
+def check_values(values: array, part: int) -> array:
+    if -1 in values:
+        line: int = values.index(-1) + 1
+        what: str = "digit" if part == 1 else "digit or spelled out number"
+        raise ValueError(f"part {part} is undefined, line {line} contains no {what}")
+    return values
+
+
+def solve_part1(values: tuple[array, array]) -> int:
+    return sum(check_values(values[0], 1))
+
+
+def solve_part2(values: tuple[array, array]) -> int:
+    return sum(check_values(values[1], 2))
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    values: tuple[array, array] = parse(path)
+
+    phase("part1")
+
+    # print, but continue with part 2 on inputs without digits, such as the example of part 2
+    try:
+        sum_nums: int = solve_part1(values)
+    except ValueError as e:
+        print(e)
+    else:
+        print(f"{sum_nums=} (truth={truths[0]})")
+
+    phase("part2")
 
     # print
-    print(f"{sum_nums=} (truth={53868 if part_two else 54953})")
+    sum_nums = solve_part2(values)
+    print(f"{sum_nums=} (truth={truths[1]})")
 
 
 if __name__ == "__main__":
-    main(part_two=False)
-    main(part_two=True)
+    main()
@@ -3,86 +3,68 @@
 from __future__ import annotations
 
 import os
+import sys
 import itertools
-import functools
-from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.grid import PaddedGrid
+from aoc.instrument import phase
+from aoc.memo import memoize
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
+# bits of the directions in which a point is connected to its neighbors
+link_bits: dict[str, int] = {"t": 1, "r": 2, "b": 4, "l": 8}
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    # read the maze, surrounded by a border of ground
+    maze: PaddedGrid = PaddedGrid.from_grid(Input(path).grid(), border=ord("."))
+    tiles: list[str] = list(maze.chars())
+    offsets: dict[str, int] = dict(zip("trbl", maze.neighbors4))
 
-@dataclass
-class LoopPoint:
-    # coordinates
-    x: int
-    y: int
-
-    # value
-    v: str
-
-    # neighbors
-    t: LoopPoint | None = None
-    r: LoopPoint | None = None
-    b: LoopPoint | None = None
-    l: LoopPoint | None = None
-
-    def __hash__(self) -> int:
-        return hash(self.coord)
-
-    def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(x={self.x}, y={self.y}, v={self.v})"
-
-    @property
-    def coord(self) -> tuple[int, int]:
-        return (self.x, self.y)
-
-    @property
-    def neighbors(self) -> dict[str, LoopPoint]:
-        return dict([(d, n) for d in "trbl" if (n := getattr(self, d))])
-
-
-def main() -> None:
-    # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
-
-    # parse points that make up the maze, remember the start
-    maze: dict[tuple[int, int], LoopPoint] = {}
-    start: LoopPoint
-    for y, line in enumerate(lines):
-        for x, v in enumerate(line):
-            maze[(x, y)] = LoopPoint(x, y, v)
-            if v == "S":
-                start = maze[(x, y)]
-
-    # connect neighbors, checking right or bottom
-    prod = functools.cache(lambda *args: set(itertools.product(*args)))
-    for point in maze.values():
-        if (p := maze.get((point.x, point.y + 1))) and (point.v, p.v) in prod("S|7F", "S|JL"):
-            point.b = p
-            p.t = point
-        if (p := maze.get((point.x + 1, point.y))) and (point.v, p.v) in prod("S-LF", "S-J7"):
-            point.r = p
-            p.l = point
+    # remember the start
+    start: int = maze.find(b"S")
+
+    # connect neighbors, checking right or bottom, and store the directions of connected neighbors
+    # per point as bits
+    links: bytearray = bytearray(len(maze))
+    prod = memoize(maxsize=8)(lambda *args: set(itertools.product(*args)))
+    for i in maze.indices():
+        if (tiles[i], tiles[i + offsets["b"]]) in prod("S|7F", "S|JL"):
+            links[i] |= link_bits["b"]
+            links[i + offsets["b"]] |= link_bits["t"]
+        if (tiles[i], tiles[i + offsets["r"]]) in prod("S-LF", "S-J7"):
+            links[i] |= link_bits["r"]
+            links[i + offsets["r"]] |= link_bits["l"]
+
+    # helper to get the directions of connected neighbors
+    neighbors = lambda i: [d for d in "trbl" if links[i] & link_bits[d]]
 
     # replace the correct starting field
-    start.v = {"tl": "J", "tb": "|", "bl": "7", "rl": "-", "rb": "F"}["".join(start.neighbors)]
+    tiles[start] = {"tl": "J", "tb": "|", "bl": "7", "rl": "-", "rb": "F"}["".join(neighbors(start))]
 
     #
     # part 1
     #
 
-    # find points on the loop
-    loop: set[LoopPoint] = set()
-    cur: LoopPoint = start
+    phase("part1")
+
+    # find points on the loop, marked in a flat mask
+    loop: bytearray = bytearray(len(maze))
+    cur: int = start
     while True:
-        loop.add(cur)
-        if not (next_d := [d for d, n in cur.neighbors.items() if n not in loop]):
+        loop[cur] = 1
+        if not (next_d := [d for d in neighbors(cur) if not loop[cur + offsets[d]]]):
             break
-        cur = getattr(cur, next_d[0])
+        cur += offsets[next_d[0]]
 
     # get the distance as half the loop length (floored)
-    max_dist: int = len(loop) >> 1
+    max_dist: int = loop.count(1) >> 1
 
     # results
     print(f"{max_dist=} (truth=6757)")
@@ -91,32 +73,29 @@ def main() -> None:
     # part 2
     #
 
-    # get the bounding box containing the loop within the maze
-    x_min = min(p.x for p in loop)
-    x_max = max(p.x for p in loop)
-    y_min = min(p.y for p in loop)
-    y_max = max(p.y for p in loop)
+    phase("part2")
 
     # for each line, scan from left to right and count the number of real crossings over the loop
     # then, count a normal field if the number of crossings is odd
+    # (fields outside the bounding box of the loop always have an even number of crossings)
     n_inside: int = 0
-    for y in range(y_min, y_max + 1):
+    for y in range(maze.n_rows):
         n_crossings: int = 0
-        loop_start: LoopPoint | None = None
-        for x in range(x_min, x_max + 1):
-            p: LoopPoint = maze.get((x, y))
-            if p in loop:
+        loop_start: str | None = None
+        for i in range(maze.index(0, y), maze.index(maze.n_cols, y)):
+            v: str = tiles[i]
+            if loop[i]:
                 if loop_start is None:
-                    if p.v in ("F", "L"):
+                    if v in ("F", "L"):
                         # start running on the loop
-                        loop_start = p
+                        loop_start = v
                     else:
                         # entering perpendicularly
                         n_crossings += 1
-                elif p.v == "-":
+                elif v == "-":
                     # continuing walking on it
                     pass
-                elif (loop_start.v, p.v) in (("F", "7"), ("L", "J")):
+                elif (loop_start, v) in (("F", "7"), ("L", "J")):
                     # leaving without ever having entered
                     loop_start = None
                 else:
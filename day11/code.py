@@ -3,20 +3,31 @@
 from __future__ import annotations
 
 import os
+import sys
 import itertools
+from typing import TypeAlias
 
-import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-def main(expansion_factor: int, truth: int) -> None:
+# answers of the actual input
+truths: tuple[int, int] = (9686930, 630728425490)
+
+# galaxy coordinates, expanding rows and expanding columns
+Universe: TypeAlias = tuple[list[tuple[int, int]], set[int], set[int]]
+
+
+def parse(path: str) -> Universe:
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
-    # read in the universe as a numpy array
+    # read in the universe as a numpy array, importing numpy only when parsing
+    import numpy as np
     universe: np.ndarray = np.array([[c == "#" for c in line] for line in lines], dtype=np.int8)
 
     # get expanding rows and columns
@@ -26,6 +37,12 @@ def main(expansion_factor: int, truth: int) -> None:
     # get galaxy coordinates
     coords: list[tuple[int, int]] = list(zip(*np.where(universe == 1)))
 
+    return coords, expand_rows, expand_cols
+
+
+def solve(universe: Universe, expansion_factor: int) -> int:
+    coords, expand_rows, expand_cols = universe
+
     # distance between two galaxies
     def get_distance(x1: int, y1: int, x2: int, y2: int) -> int:
         # normal distance
@@ -39,16 +56,38 @@ def main(expansion_factor: int, truth: int) -> None:
 
         return dist
 
-    # get sum of distances
-    sum_dist: int = sum(
+    # get sum of distances (as a python int rather than a numpy scalar)
+    return int(sum(
         get_distance(x1, y1, x2, y2)
         for (y1, x1), (y2, x2) in itertools.combinations(coords, 2)
-    )
+    ))
+
+
+def solve_part1(universe: Universe) -> int:
+    return solve(universe, expansion_factor=2)
+
+
+def solve_part2(universe: Universe) -> int:
+    return solve(universe, expansion_factor=1_000_000)
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    universe: Universe = parse(path)
+
+    phase("part1")
+
+    # results
+    sum_dist: int = solve_part1(universe)
+    print(f"{sum_dist=} (truth={truths[0]})")
+
+    phase("part2")
 
     # results
-    print(f"{sum_dist=} ({truth=})")
+    sum_dist = solve_part2(universe)
+    print(f"{sum_dist=} (truth={truths[1]})")
 
 
 if __name__ == "__main__":
-    main(expansion_factor=2, truth=9686930)
-    main(expansion_factor=1_000_000, truth=630728425490)
+    main()
@@ -3,28 +3,43 @@
 from __future__ import annotations
 
 import os
+import sys
 import re
-from functools import cache
-from typing import Generator
+from typing import Generator, Iterable, TypeAlias
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase, count_cache
+from aoc.memo import memoize
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-def main(*, part: int) -> None:
-    assert part in (1, 2)
+# answers of the actual input
+truths: tuple[int, int] = (7025, 11461095383315)
+
+# conditions and counts of broken springs per line
+Records: TypeAlias = list[tuple[str, tuple[int, ...]]]
+
+
+def parse_record(line: str) -> tuple[str, tuple[int, ...]]:
+    conditions, broken_counts = line.split()
+    return conditions, tuple(map(int, broken_counts.split(",")))
+
 
+def parse(path: str) -> Records:
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    return list(map(parse_record, Input(path).lines()))
 
-    # parse and pad by one working spring on each side to avoid special cases
+
+def solve(records: Records, scale: int) -> int:
+    # unfold and pad by one working spring on each side to avoid special cases
     springs: list[tuple[str, tuple[int, ...]]] = []
-    scale: int = {1: 1, 2: 5}[part]
-    for conditions, broken_counts in (line.split() for line in lines):
+    for conditions, broken_counts in records:
         springs.append((
             "." + "?".join([conditions] * scale) + ".",
-            tuple(map(int, broken_counts.split(","))) * scale,
+            broken_counts * scale,
         ))
 
     # helper to get portions of conditions line, starting at the front, that could accomodate
@@ -41,8 +56,9 @@ def main(*, part: int) -> None:
             yield conditions[start + n_broken + 1:]
 
     # helper to count the number of combinations
-    # (for long condition lines, sub conditions are often repeated, so cache)
-    @cache
+    # (for long condition lines, sub conditions are often repeated, so cache, bounded by far more
+    # than the suffixes and remaining counts of a single line)
+    @memoize(maxsize=1 << 16)
     def count_combinations(conditions: str, broken_counts: tuple[int, ...]) -> int:
         # if no spring is broken at all, consider conditions that still have "#" as "no combination"
         if not broken_counts:
@@ -55,11 +71,48 @@ def main(*, part: int) -> None:
 
     # sum up possible combinations per line
     sum_combinations: int = sum(map(lambda args: count_combinations(*args), springs))
+    count_cache("count_combinations", count_combinations)
+
+    return sum_combinations
+
+
+def stream(lines: Iterable[str]) -> tuple[int, int]:
+    # records are independent, so solve them one at a time, which also drops cached combinations
+    # after each line and keeps memory bounded by the longest line
+    sum_combinations1: int = 0
+    sum_combinations2: int = 0
+    for line in lines:
+        records: Records = [parse_record(line)]
+        sum_combinations1 += solve(records, scale=1)
+        sum_combinations2 += solve(records, scale=5)
+    return sum_combinations1, sum_combinations2
+
+
+def solve_part1(records: Records) -> int:
+    return solve(records, scale=1)
+
+
+def solve_part2(records: Records) -> int:
+    return solve(records, scale=5)
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    records: Records = parse(path)
+
+    phase("part1")
+
+    # results
+    sum_combinations: int = solve_part1(records)
+    print(f"{sum_combinations=} (truth={truths[0]})")
+
+    phase("part2")
 
     # results
-    print(f"{sum_combinations=} (truth={7025 if part == 1 else 11461095383315})")
+    sum_combinations = solve_part2(records)
+    print(f"{sum_combinations=} (truth={truths[1]})")
 
 
 if __name__ == "__main__":
-    main(part=1)
-    main(part=2)
+    main()
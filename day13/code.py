@@ -3,52 +3,50 @@
 from __future__ import annotations
 
 import os
-from functools import cached_property
+import sys
 from dataclasses import dataclass, field
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
+
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Pattern:
-    lines: list[str] = field(default_factory=list)
+    # lines are stored as a tuple, also when passed as a list, so that patterns are hashable
+    lines: tuple[str, ...] = ()
+    # dimensions and columns, computed once as both parts iterate them
+    n_rows: int = field(init=False)
+    n_cols: int = field(init=False)
+    cols: tuple[str, ...] = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "lines", tuple(self.lines))
+        object.__setattr__(self, "n_rows", len(self.lines))
+        object.__setattr__(self, "n_cols", len(self.lines[0]) if self.lines else 0)
+        object.__setattr__(self, "cols", tuple("".join(row[i] for row in self.lines) for i in range(self.n_cols)))
 
     def __repr__(self) -> str:
         return f"Pattern(n_rows={self.n_rows}, n_cols={self.n_cols})"
 
-    @cached_property
-    def n_rows(self) -> int:
-        return len(self.lines)
-
-    @cached_property
-    def n_cols(self) -> int:
-        return len(self.lines[0])
-
     @property
-    def rows(self) -> list[str]:
+    def rows(self) -> tuple[str, ...]:
         return self.lines
 
-    @cached_property
-    def cols(self) -> list[str]:
-        return ["".join(row[i] for row in self.lines) for i in range(self.n_cols)]
 
+# answers of the actual input
+truths: tuple[int, int] = (42974, 27587)
 
-def main(*, part: int) -> None:
-    assert part in (1, 2)
 
-    # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line.strip() for line in f.readlines()]
+def parse(path: str) -> list[Pattern]:
+    # read blocks of lines and parse them into patterns
+    return [Pattern(lines) for lines in Input(path).blocks()]
 
-    # parse into patterns
-    patterns: list[Pattern] = [Pattern()]
-    for line in lines:
-        if line:
-            patterns[-1].lines.append(line)
-        else:
-            patterns.append(Pattern())
 
+def solve(patterns: list[Pattern], n_smudges: int) -> int:
     # helper to determine number of differing sequence elements
     n_diff = lambda seq1, seq2: sum(1 for i in range(len(seq1)) if seq1[i] != seq2[i])
 
@@ -61,7 +59,7 @@ def main(*, part: int) -> None:
             if sum(
                 n_diff(row[i - w:i], row[i:i + w][::-1])
                 for row in pattern.rows
-            ) == (0 if part == 1 else 1):
+            ) == n_smudges:
                 sum_left_cols += i
                 break
 
@@ -74,14 +72,39 @@ def main(*, part: int) -> None:
             if sum(
                 n_diff(col[i - h:i], col[i:i + h][::-1])
                 for col in pattern.cols
-            ) == (0 if part == 1 else 1):
+            ) == n_smudges:
                 sum_top_rows += i
                 break
 
+    return sum_left_cols + 100 * sum_top_rows
+
+
+def solve_part1(patterns: list[Pattern]) -> int:
+    return solve(patterns, n_smudges=0)
+
+
+def solve_part2(patterns: list[Pattern]) -> int:
+    # exactly one smudge must be fixed
+    return solve(patterns, n_smudges=1)
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    patterns: list[Pattern] = parse(path)
+
+    phase("part1")
+
+    # results
+    summary: int = solve_part1(patterns)
+    print(f"{summary=} (truth={truths[0]})")
+
+    phase("part2")
+
     # results
-    print(f"{sum_left_cols + 100 * sum_top_rows=} (truth={42974 if part == 1 else 27587})")
+    summary = solve_part2(patterns)
+    print(f"{summary=} (truth={truths[1]})")
 
 
 if __name__ == "__main__":
-    main(part=1)
-    main(part=2)
+    main()
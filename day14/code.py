@@ -3,21 +3,28 @@
 from __future__ import annotations
 
 import os
+import sys
 import re
 import math
-from functools import cache
 from typing import TypeAlias
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Grid, Input
+from aoc.instrument import phase, timed, count_cache
+from aoc.memo import memoize
+
 
 Rows: TypeAlias = tuple[str, ...]
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-def main() -> None:
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read rows
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        rows: Rows = tuple(line for line in (line.strip() for line in f.readlines()) if line)
+    grid: Grid = Input(path).grid()
+    rows: Rows = tuple(str(row, "utf-8") for row in grid.rows())
 
     # helper to rotate left
     def rotate_left(rows: Rows) -> Rows:
@@ -40,17 +47,23 @@ def main() -> None:
 
     # helper to shift round rocks to the left
     cre = re.compile(r"(#([^#]+))")
-    _shift_left = cache(lambda row: cre.sub(lambda m: "#" + "".join(reversed(sorted(m.group(2)))), "#" + row)[1:])
+    _shift_left = memoize(maxsize=1 << 14)(
+        lambda row: cre.sub(lambda m: "#" + "".join(reversed(sorted(m.group(2)))), "#" + row)[1:],
+    )
     shift_left = lambda rows: tuple(map(_shift_left, rows))
 
     # helper to count the north load
-    _count_north_load = cache(lambda row: sum(i for i, stone in enumerate(reversed(row), 1) if stone == "O"))
+    _count_north_load = memoize(maxsize=1 << 12)(
+        lambda row: sum(i for i, stone in enumerate(reversed(row), 1) if stone == "O"),
+    )
     count_north_load = lambda rows: sum(map(_count_north_load, rows))
 
     #
     # part 1
     #
 
+    phase("part1")
+
     # just shift to the left, then sum up
     north_load: int = count_north_load(shift_left(rows))
 
@@ -61,8 +74,12 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # helper for perform a full cycle
-    @cache
+    # (the cache only needs to hold the states of the repeating sequence of at most 100 cycles)
+    @timed("cycle")
+    @memoize(maxsize=128)
     def cycle(rows: Rows) -> Rows:
         # shift towards north
         rows = shift_left(rows)
@@ -95,6 +112,9 @@ def main() -> None:
 
     # get the load
     north_load = history[n_cycle - 1][1]
+    count_cache("cycle", cycle)
+    count_cache("shift_left", _shift_left)
+    count_cache("count_north_load", _count_north_load)
 
     # results
     print(f"{north_load=} (truth=90176)")
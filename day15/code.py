@@ -3,16 +3,22 @@
 from __future__ import annotations
 
 import os
+import sys
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
+
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-def main() -> None:
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse steps
     steps: list[str] = lines[0].split(",")
@@ -27,6 +33,8 @@ def main() -> None:
     # part 1
     #
 
+    phase("part1")
+
     # sum of hashes
     sum_hashes: int = sum(map(create_hash, steps))
 
@@ -37,6 +45,8 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # setup boxes
     boxes: dict[int, dict[str, int]] = {i: {} for i in range(1, 256 + 1)}
 
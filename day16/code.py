@@ -3,109 +3,110 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
+import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.grid import PaddedGrid
+from aoc.instrument import phase, count
+from aoc.cache import cached_parse
 
-this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
+this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
-@dataclass
-class Tile:
-    x: int
-    y: int
-    symbol: str
-    reached_from: set[str] = field(default_factory=set)
+# bits per direction from which a tile was reached
+direction_bits: dict[str, int] = {"r": 1, "l": 2, "d": 4, "u": 8}
 
-    @property
-    def energized(self) -> bool:
-        return len(self.reached_from) > 0
 
-    def reset(self) -> None:
-        self.reached_from.clear()
+@cached_parse
+def parse(path: str) -> PaddedGrid:
+    # read the grid, surrounded by a border of zeros that marks leaving it
+    return PaddedGrid.from_grid(Input(path).grid(), border=0)
 
 
-def main() -> None:
-    # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
 
     # parse tiles
-    tiles: dict[tuple[int, int], Tile] = {}
-    for y, line in enumerate(lines, 1):
-        for x, symbol in enumerate(line, 1):
-            tiles[(x, y)] = Tile(x, y, symbol)
+    tiles: PaddedGrid = parse(path)
+    symbols: str = tiles.chars()
 
     # the field is a square, so get the side length
-    n_side: int = len(lines)
+    n_side: int = tiles.n_rows
+
+    # directions from which tiles were reached, as bits per flat tile index
+    reached_from: bytearray = bytearray(len(tiles))
 
-    # helper to calculate the next coordinate given a direction
-    def next_coord(x: int, y: int, direction: str) -> tuple[int, int]:
-        return (x + {"r": 1, "l": -1}.get(direction, 0), y + {"d": 1, "u": -1}.get(direction, 0))
+    # helper to calculate the next flat index given a direction
+    def next_coord(i: int, direction: str) -> int:
+        return i + tiles.offsets[direction]
 
     # helper to propagate a beam given a starting point and direction
     def propagate_beam(x: int, y: int, direction: str) -> None:
         # reset tiles
-        tile: Tile | None
-        for tile in tiles.values():
-            tile.reset()
+        reached_from[:] = bytes(len(tiles))
 
         # start propagation
-        beams: list[tuple[tuple[int, int], str]] = [((x, y), direction)]
+        beams: list[tuple[int, str]] = [(tiles.index(x, y), direction)]
         while beams:
-            coord, direction = beams.pop()
+            i, direction = beams.pop()
+            count("beam_pops")
 
             # out of bounds?
-            if not (tile := tiles.get(coord)):
+            if not tiles[i]:
                 continue
 
             # has this tile already been reached from this side?
-            if direction in tile.reached_from:
+            if reached_from[i] & (bit := direction_bits[direction]):
                 continue
 
             # energize it
-            tile.reached_from.add(direction)
+            reached_from[i] |= bit
 
             # propagate
-            if tile.symbol == ".":
+            symbol = symbols[i]
+            if symbol == ".":
                 # continue propagating
-                beams.append((next_coord(*coord, direction), direction))
-            elif tile.symbol == "|":
+                beams.append((next_coord(i, direction), direction))
+            elif symbol == "|":
                 if direction in "rl":
                     # add new beams
-                    beams.append((next_coord(*coord, "u"), "u"))
-                    beams.append((next_coord(*coord, "d"), "d"))
+                    beams.append((next_coord(i, "u"), "u"))
+                    beams.append((next_coord(i, "d"), "d"))
                 else:
                     # just propagate
-                    beams.append((next_coord(*coord, direction), direction))
-            elif tile.symbol == "-":
+                    beams.append((next_coord(i, direction), direction))
+            elif symbol == "-":
                 if direction in "ud":
                     # add new beams
-                    beams.append((next_coord(*coord, "r"), "r"))
-                    beams.append((next_coord(*coord, "l"), "l"))
+                    beams.append((next_coord(i, "r"), "r"))
+                    beams.append((next_coord(i, "l"), "l"))
                 else:
                     # just propagate
-                    beams.append((next_coord(*coord, direction), direction))
-            elif tile.symbol == "/":
+                    beams.append((next_coord(i, direction), direction))
+            elif symbol == "/":
                 # reflect
                 new_direction = {"r": "u", "l": "d", "d": "l", "u": "r"}[direction]
-                beams.append((next_coord(*coord, new_direction), new_direction))
-            elif tile.symbol == "\\":
+                beams.append((next_coord(i, new_direction), new_direction))
+            elif symbol == "\\":
                 # reflect
                 new_direction = {"r": "d", "l": "u", "d": "r", "u": "l"}[direction]
-                beams.append((next_coord(*coord, new_direction), new_direction))
+                beams.append((next_coord(i, new_direction), new_direction))
             else:
                 assert False
 
     # helper to get the number of currently energized tiles
     def count_energized() -> int:
-        return sum(1 for tile in tiles.values() if tile.energized)
+        return len(reached_from) - reached_from.count(0)
 
     #
     # part 1
     #
 
+    phase("part1")
+
     # propagate and count
-    propagate_beam(1, 1, "r")
+    propagate_beam(0, 0, "r")
     n_energized: int = count_energized()
 
     # results
@@ -115,20 +116,22 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # propagate from each edge tile
     n_energized = 0
-    for i in range(1, n_side + 1):
+    for i in range(n_side):
         # top edge
-        propagate_beam(i, 1, "d")
+        propagate_beam(i, 0, "d")
         n_energized = max(n_energized, count_energized())
         # bottom edge
-        propagate_beam(i, n_side, "u")
+        propagate_beam(i, n_side - 1, "u")
         n_energized = max(n_energized, count_energized())
         # left edge
-        propagate_beam(1, i, "r")
+        propagate_beam(0, i, "r")
         n_energized = max(n_energized, count_energized())
         # right edge
-        propagate_beam(n_side, i, "l")
+        propagate_beam(n_side - 1, i, "l")
         n_energized = max(n_energized, count_energized())
 
     print(f"{n_energized=} (truth=7831)")
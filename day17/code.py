@@ -3,58 +3,61 @@
 from __future__ import annotations
 
 import os
+import sys
 import heapq
 from collections import namedtuple
-from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.grid import PaddedGrid
+from aoc.instrument import phase, count
+from aoc.cache import cached_parse
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
-class Node:
-    x: int
-    y: int
-    cost: int
+# type alias for a path (not using a dataclass because sorting with multiple keys is a pain),
+# referring to nodes by their flat index
+Path = namedtuple("Path", ["cost", "i", "direction", "n_straight"])
 
+# translation of ascii digits to their value, leaving all other bytes untouched
+digit_values: bytes = bytes(c - ord("0") if chr(c).isdigit() else c for c in range(256))
 
-# type alias for a path (not using a dataclass because sorting with multiple keys is a pain):
-Path = namedtuple("Path", ["cost", "x", "y", "direction", "n_straight"])
 
+@cached_parse
+def parse(path: str) -> PaddedGrid:
+    # read the grid surrounded by a border that cannot be a cost, then convert digits to costs
+    grid: PaddedGrid = PaddedGrid.from_grid(Input(path).grid(), border=0xff)
+    return grid.translate(digit_values)
 
-def main(*, part: int) -> None:
-    assert part in (1, 2)
 
-    # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+# answers of the actual input
+truths: tuple[int, int] = (674, 773)
 
-    # get dimensions
-    n_rows: int = len(lines)
-    n_cols: int = len(lines[0])
 
-    # parse into nodes
-    nodes: dict[tuple[int, int], Node] = {}
-    for y, line in enumerate(lines, 1):
-        for x, c in enumerate(line, 1):
-            nodes[(x, y)] = Node(x, y, int(c))
+def solve(nodes: PaddedGrid, part: int) -> int:
+    # the target is the bottom right node
+    target: int = nodes.index(nodes.n_cols - 1, nodes.n_rows - 1)
 
     # start with the top left node with zero cost and no previous direction
-    paths: list[Path] = [Path(0, 1, 1, "", 0)]
+    paths: list[Path] = [Path(0, nodes.index(0, 0), "", 0)]
     seen = set()
     while True:
         # get the next path with the lowest cost
         assert paths
         path = heapq.heappop(paths)
+        count("heap_pops")
 
         # found the target?
-        if (path.x, path.y) == (n_cols, n_rows):
+        if path.i == target:
             break
 
         # did we get to this node before from the same direction?
         # (caching by both the last direction AND the number of straight steps is key here!)
         key = path[1:]  # use all but the cost to hash
         if key in seen:
+            count("seen_hits")
             continue
         seen.add(key)
 
@@ -65,9 +68,8 @@ def main(*, part: int) -> None:
                 continue
 
             # check bounds
-            x = path.x + {"l": -1, "r": 1}.get(direction, 0)
-            y = path.y + {"u": -1, "d": 1}.get(direction, 0)
-            if not (1 <= x <= n_cols) or not (1 <= y <= n_rows):
+            i = path.i + nodes.offsets[direction]
+            if nodes[i] == nodes.border:
                 continue
 
             # count straight steps
@@ -86,15 +88,41 @@ def main(*, part: int) -> None:
                     continue
 
             # add next path
+            count("heap_pushes")
             heapq.heappush(
                 paths,
-                Path(path.cost + nodes[(x, y)].cost, x, y, direction, n_straight),
+                Path(path.cost + nodes[i], i, direction, n_straight),
             )
 
+    return path.cost
+
+
+def solve_part1(nodes: PaddedGrid) -> int:
+    return solve(nodes, part=1)
+
+
+def solve_part2(nodes: PaddedGrid) -> int:
+    return solve(nodes, part=2)
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    # parse into costs of nodes
+    nodes: PaddedGrid = parse(path)
+
+    phase("part1")
+
+    # results
+    cost: int = solve_part1(nodes)
+    print(f"{cost=} (truth={truths[0]})")
+
+    phase("part2")
+
     # results
-    print(f"{path.cost=} (truth={674 if part == 1 else 773})")
+    cost = solve_part2(nodes)
+    print(f"{cost=} (truth={truths[1]})")
 
 
 if __name__ == "__main__":
-    main(part=1)
-    main(part=2)
+    main()
@@ -3,40 +3,46 @@
 from __future__ import annotations
 
 import os
+import sys
 from dataclasses import dataclass
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
+
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Instruction:
     d: str
     n: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Point:
     x: int
     y: int
 
 
-def main(*, part: int) -> None:
-    assert part in (1, 2)
+# answers of the actual input
+truths: tuple[int, int] = (44436, 106941819907437)
+
 
-    # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+def parse(path: str) -> list[tuple[str, int, str]]:
+    # read lines into direction, number of steps and color
+    lines: list[str] = Input(path).lines()
 
-    # parse the instructions
-    instructions: list[Instruction] = []
+    plan: list[tuple[str, int, str]] = []
     for line in lines:
         d, n, col = line.split()
-        instructions.append(Instruction(
-            d if part == 1 else "RDLU"[int(col[-2])],
-            int(n) if part == 1 else int(col[2:-2], 16),
-        ))
+        plan.append((d, int(n), col))
+
+    return plan
+
 
+def solve(instructions: list[Instruction]) -> int:
     # get corner points and count the number of edge points
     corners: list[Point] = [Point(1, 1)]
     n_edge_points: int = 0
@@ -59,10 +65,33 @@ def main(*, part: int) -> None:
     # (again, the number of edge points is always even by construction, so integer division is ok)
     n_inside: int = area + n_edge_points // 2 + 1
 
+    return n_inside
+
+
+def solve_part1(plan: list[tuple[str, int, str]]) -> int:
+    return solve([Instruction(d, n) for d, n, _ in plan])
+
+
+def solve_part2(plan: list[tuple[str, int, str]]) -> int:
+    # the actual instructions are encoded in the colors
+    return solve([Instruction("RDLU"[int(col[-2])], int(col[2:-2], 16)) for _, _, col in plan])
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    plan: list[tuple[str, int, str]] = parse(path)
+
+    phase("part1")
+
+    # results
+    print(f"{solve_part1(plan)} (truth={truths[0]})")
+
+    phase("part2")
+
     # results
-    print(f"{n_inside} (truth={44436 if part == 1 else 106941819907437})")
+    print(f"{solve_part2(plan)} (truth={truths[1]})")
 
 
 if __name__ == "__main__":
-    main(part=1)
-    main(part=2)
+    main()
@@ -3,26 +3,32 @@
 from __future__ import annotations
 
 import os
+import sys
 import re
 import functools
 from operator import lt, gt, mul
 from dataclasses import dataclass, field
 from typing import Callable, TypeAlias
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
+from aoc.cache import cached_parse
+
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
+@dataclass(slots=True)
 class Part:
     ratings: dict[str, int]
+    sum_ratings: int = field(init=False, compare=False)
 
-    @property
-    def sum_ratings(self) -> int:
-        return sum(self.ratings.values())
+    def __post_init__(self) -> None:
+        self.sum_ratings = sum(self.ratings.values())
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Condition:
     attr: str
     op: Callable[[int, int], bool]
@@ -44,7 +50,7 @@ class Condition:
         return Condition(self.attr, self.op, self.threshold, self.target, not self.test_reverse)
 
 
-@dataclass
+@dataclass(slots=True)
 class Rule:
     name: str
     condition_line: str
@@ -58,10 +64,10 @@ class Rule:
         return hash(self.name)
 
 
-def main() -> None:
+@cached_parse
+def parse(path: str) -> tuple[dict[str, Rule], list[Part]]:
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse into rules and parts
     rules: dict[str, Rule] = {}
@@ -87,10 +93,21 @@ def main() -> None:
             else:
                 rule.decision = rules[cond_str]
 
+    return rules, parts
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    # parse into rules and parts
+    rules, parts = parse(path)
+
     #
     # part 1
     #
 
+    phase("part1")
+
     # helper to check if a part is accepted
     def is_accepted(part: Part) -> bool:
         rule = rules["in"]
@@ -118,6 +135,8 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     NestedConditions: TypeAlias = list[list[Condition]]
     leaf_conditions: dict[Rule, NestedConditions] = {}
 
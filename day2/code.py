@@ -1,51 +1,240 @@
 # coding: utf-8
 
+from __future__ import annotations
+
 import os
+import sys
+from typing import TYPE_CHECKING, Iterable, TypeAlias
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 colors: list[str] = ["red", "green", "blue"]
 
+# maximum number of cubes per color in part 1
+limits: tuple[int, int, int] = (12, 13, 14)
+
+# answers of the actual input
+truths: tuple[int, int] = (2545, 78111)
+
+# game ids and the maximum number of red, green and blue cubes drawn per game
+Games: TypeAlias = tuple["np.ndarray", "np.ndarray"]
+
 
-def main() -> None:
-    # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+def evaluate(line: str) -> tuple[int, int]:
+    # get the game id, the uggly way
+    game_id: int = int(line.split(":", 1)[0].split(" ", 1)[1])
 
-    # loop through games
+    # get the draws for this game
+    draws: list[tuple[int, int, int]] = []
+    for part in line.split(":", 1)[1].split(";"):
+        draw: list[int] = [0, 0, 0]  # r, g, b
+        for s in part.strip().split(","):
+            n, col = s.strip().split(" ", 1)
+            draw[colors.index(col)] = int(n)
+        draws.append(tuple(draw))
+
+    # check if possible
+    possible: bool = (
+        all(r <= limits[0] for r, _, _ in draws) and
+        all(g <= limits[1] for _, g, _ in draws) and
+        all(b <= limits[2] for _, _, b in draws)
+    )
+
+    # power
+    power: int = (
+        max(r for r, _, _ in draws) *
+        max(g for _, g, _ in draws) *
+        max(b for _, _, b in draws)
+    )
+
+    return (game_id if possible else 0), power
+
+
+def stream(lines: Iterable[str]) -> tuple[int, int]:
+    # loop through games, each line being independent, so this works in constant memory
     sum_ids: int = 0
     sum_powers: int = 0
     for line in lines:
-        # get the game id, the uggly way
-        game_id: int = int(line.split(":", 1)[0].split(" ", 1)[1])
-
-        # get the draws for this game
-        draws: list[tuple[int, int, int]] = []
-        for part in line.split(":", 1)[1].split(";"):
-            draw: list[int] = [0, 0, 0]  # r, g, b
-            for s in part.strip().split(","):
-                n, col = s.strip().split(" ", 1)
-                draw[colors.index(col)] = int(n)
-            draws.append(tuple(draw))
-
-        # check if possible
-        if (
-            all(r <= 12 for r, _, _ in draws) and
-            all(g <= 13 for _, g, _ in draws) and
-            all(b <= 14 for _, _, b in draws)
-        ):
-            sum_ids += game_id
-
-        # add power
-        sum_powers += (
-            max(r for r, _, _ in draws) *
-            max(g for _, g, _ in draws) *
-            max(b for _, _, b in draws)
+        game_id, power = evaluate(line)
+        sum_ids += game_id
+        sum_powers += power
+    return sum_ids, sum_powers
+
+
+def parse(path: str) -> Games:
+    # columns of game ids and maximum numbers of red, green and blue cubes, parsed at once from the
+    # raw bytes, where each number is followed by ":" for game ids or by the initial of its color
+    import numpy as np
+
+    buf: np.ndarray = np.frombuffer(Input(path).raw, dtype=np.uint8)
+
+    # start and end positions of all numbers, padding the buffer so that every number is followed
+    # by two more bytes
+    buf = np.concatenate((buf, np.zeros(2, dtype=np.uint8)))
+    is_digit: np.ndarray = (buf >= ord("0")) & (buf <= ord("9"))
+    edges: np.ndarray = np.diff(is_digit.astype(np.int8), prepend=0)
+    starts: np.ndarray = np.flatnonzero(edges == 1)
+    ends: np.ndarray = np.flatnonzero(edges == -1)
+
+    # decode all numbers digit by digit
+    lengths: np.ndarray = ends - starts
+    values: np.ndarray = np.zeros(len(starts), dtype=np.int64)
+    for k in range(lengths.max(initial=0)):
+        m: np.ndarray = lengths > k
+        values[m] = values[m] * 10 + (buf[starts[m] + k] - ord("0"))
+
+    # split into game ids and cube counts, and assign counts to games and colors
+    is_id: np.ndarray = buf[ends] == ord(":")
+    game_ids: np.ndarray = values[is_id]
+    game_idx: np.ndarray = np.cumsum(is_id)[~is_id] - 1
+    color_lut: np.ndarray = np.zeros(256, dtype=np.int64)
+    for i, col in enumerate(colors):
+        color_lut[ord(col[0])] = i
+    color_idx: np.ndarray = color_lut[buf[ends[~is_id] + 1]]
+
+    # maximum per game and color
+    max_rgb: np.ndarray = np.zeros((len(game_ids), 3), dtype=np.int64)
+    np.maximum.at(max_rgb, (game_idx, color_idx), values[~is_id])
+
+    return game_ids, max_rgb
+
+
+def solve_part1(games: Games) -> int:
+    # sum of ids of games that are possible with the limited number of cubes
+    game_ids, max_rgb = games
+    return int(game_ids[(max_rgb <= limits).all(axis=1)].sum())
+
+
+def solve_part2(games: Games) -> int:
+    # sum of powers of the minimal sets of cubes
+    _, max_rgb = games
+    return int(max_rgb.prod(axis=1).sum())
+
+
+class BagIndex:
+    # index of the maximum draws of all games, answering which games are possible for arbitrary
+    # limits of red, green and blue cubes, via id sums over buckets of values per color
+
+    # maximum number of buckets per color, bounding the id sums to 8 * max_buckets**3 bytes
+    max_buckets: int = 128
+
+    def __init__(self, games: Games, max_buckets: int | None = None) -> None:
+        import numpy as np
+
+        n_buckets: int = self.max_buckets if max_buckets is None else max_buckets
+        game_ids, max_rgb = games
+
+        # lower bounds and maximum values of buckets per color, and the buckets of each game
+        self.edges: list[np.ndarray] = []
+        self.bucket_max: list[np.ndarray] = []
+        buckets: np.ndarray = np.zeros(max_rgb.shape, dtype=np.int64)
+        for i in range(3):
+            values: np.ndarray = max_rgb[:, i]
+            edges: np.ndarray = np.unique(values)
+            if len(edges) > n_buckets:
+                quantiles: np.ndarray = np.linspace(0, 1, n_buckets, endpoint=False)
+                edges = np.unique(np.quantile(values, quantiles, method="lower"))
+            buckets[:, i] = np.searchsorted(edges, values, side="right") - 1
+            bucket_max: np.ndarray = np.zeros(len(edges), dtype=np.int64)
+            np.maximum.at(bucket_max, buckets[:, i], values)
+            self.edges.append(edges)
+            self.bucket_max.append(bucket_max)
+
+        # per color, games sorted by their bucket of that color with the start of each bucket, and
+        # their ids, maxima and buckets of all colors
+        self.slabs: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        for i in range(3):
+            order: np.ndarray = np.argsort(buckets[:, i], kind="stable")
+            starts: np.ndarray = np.searchsorted(buckets[order, i], np.arange(len(self.edges[i]) + 1))
+            self.slabs.append((starts, game_ids[order], max_rgb[order], buckets[order]))
+
+        # id sums of all games whose buckets are at most those of each cell, accumulated along all
+        # three axes
+        self.id_sums: np.ndarray = np.zeros(tuple(len(edges) for edges in self.edges), dtype=np.int64)
+        np.add.at(self.id_sums, tuple(buckets.T), game_ids)
+        for axis in range(3):
+            self.id_sums = np.cumsum(self.id_sums, axis=axis)
+
+        # games sorted by their maximum red draws
+        order = np.argsort(max_rgb[:, 0], kind="stable")
+        self.sorted_ids: np.ndarray = game_ids[order]
+        self.sorted_rgb: np.ndarray = max_rgb[order]
+
+    def sum_ids(self, limits: tuple[int, int, int]) -> int:
+        # sum of ids of games possible with at most the given numbers of red, green and blue cubes
+        return int(self.sum_ids_many([limits])[0])
+
+    def sum_ids_many(self, limits: Iterable[tuple[int, int, int]]) -> np.ndarray:
+        # vectorized sum_ids() for many limits at once, except for scanning straddling buckets
+        import numpy as np
+
+        limits_arr: np.ndarray = np.asarray(list(limits), dtype=np.int64).reshape(-1, 3)
+        if not self.id_sums.size:
+            return np.zeros(len(limits_arr), dtype=np.int64)
+
+        # per color, the bucket containing the limit, and the number of buckets fully within it
+        partial: list[np.ndarray] = []
+        n_full: list[np.ndarray] = []
+        for i in range(3):
+            bucket: np.ndarray = np.searchsorted(self.edges[i], limits_arr[:, i], side="right") - 1
+            full: np.ndarray = bucket + (self.bucket_max[i][np.maximum(bucket, 0)] <= limits_arr[:, i])
+            full[bucket < 0] = 0
+            partial.append(np.where(full == bucket, bucket, -1))
+            n_full.append(full)
+
+        # games in buckets fully within the limits
+        valid: np.ndarray = (n_full[0] > 0) & (n_full[1] > 0) & (n_full[2] > 0)
+        sums: np.ndarray = np.where(
+            valid,
+            self.id_sums[tuple(np.maximum(full - 1, 0) for full in n_full)],
+            0,
         )
 
-    # results
-    print(f"{sum_ids=} (truth=2545)")
-    print(f"{sum_powers=} (truth=78111)")
+        # games in straddling buckets, counting each game only in the first one it is in
+        for q in np.flatnonzero((partial[0] >= 0) | (partial[1] >= 0) | (partial[2] >= 0)):
+            for i in range(3):
+                if (bucket := partial[i][q]) < 0:
+                    continue
+                starts, ids, rgb, buckets = self.slabs[i]
+                sl: slice = slice(starts[bucket], starts[bucket + 1])
+                mask: np.ndarray = (rgb[sl] <= limits_arr[q]).all(axis=1)
+                for j in range(i):
+                    if partial[j][q] >= 0:
+                        mask &= buckets[sl, j] != partial[j][q]
+                sums[q] += ids[sl][mask].sum()
+
+        return sums
+
+    def possible_ids(self, limits: tuple[int, int, int]) -> np.ndarray:
+        # ids of games possible with the given limits, in increasing order
+        import numpy as np
+
+        n: int = int(np.searchsorted(self.sorted_rgb[:, 0], limits[0], side="right"))
+        rgb: np.ndarray = self.sorted_rgb[:n]
+        return np.sort(self.sorted_ids[:n][(rgb[:, 1] <= limits[1]) & (rgb[:, 2] <= limits[2])])
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    games: Games = parse(path)
+
+    phase("part1")
+
+    sum_ids: int = solve_part1(games)
+    print(f"{sum_ids=} (truth={truths[0]})")
+
+    phase("part2")
+
+    sum_powers: int = solve_part2(games)
+    print(f"{sum_powers=} (truth={truths[1]})")
 
 
 if __name__ == "__main__":
@@ -7,19 +7,24 @@ Day 20, solved with fulll over-engineered OOP and event queues :)
 from __future__ import annotations
 
 import os
+import sys
 import math
 from functools import partial
 from collections import deque
 from dataclasses import dataclass, field
 from typing import TypeAlias, Callable
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase, span, count
+
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 Queue: TypeAlias = deque[Callable[[], None]]
 
 
-@dataclass
+@dataclass(slots=True)
 class Counter:
     n_low: int = 0
     n_high: int = 0
@@ -131,10 +136,11 @@ class Conjunction(HasInputs, HasOutputs, HasState):
         self.states.update({in_name: False for in_name in self.inputs})
 
 
-def main() -> None:
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse modules
     modules: dict[str, Module] = {}
@@ -178,6 +184,8 @@ def main() -> None:
     # part 1
     #
 
+    phase("part1")
+
     # setup counter and queue, reset states
     counter: Counter = Counter()
     queue: Queue = deque()
@@ -191,8 +199,10 @@ def main() -> None:
         counter.add(False)
         queue.append(partial(modules["broadcaster"].emit, False, queue, counter))
         # run the event queue
-        while queue:
-            queue.popleft()()
+        with span("press"):
+            while queue:
+                queue.popleft()()
+                count("pulses")
 
     # results
     prod: int = counter.n_low * counter.n_high
@@ -202,6 +212,8 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # reset things
     queue.clear()
     reset_states()
@@ -225,8 +237,10 @@ def main() -> None:
         queue.append(partial(modules["broadcaster"].emit, False, queue))
         n += 1
         # run the event queue
-        while queue:
-            queue.popleft()()
+        with span("press"):
+            while queue:
+                queue.popleft()()
+                count("pulses")
         # check if the conjunctions are HI
         for conj in conjs:
             if conj.name not in n_pressed and conj.out_counter.n_high == 1:
@@ -7,64 +7,64 @@ Day 21 with dynamic programming, caching and "fiddling with the padding".
 from __future__ import annotations
 
 import os
-import functools
-from dataclasses import dataclass
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Grid, Input
+from aoc.grid import PaddedGrid
+from aoc.instrument import phase, count_cache
+from aoc.memo import memoize
+from aoc.cache import cached_parse
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
-class Field:
-    x: int
-    y: int
-    is_plot: bool
+@cached_parse
+def parse(path: str) -> tuple[PaddedGrid, tuple[int, int], int]:
+    # read the grid
+    grid: Grid = Input(path).grid()
 
-    def __hash__(self) -> int:
-        return hash((self.x, self.y))
+    # get dimensions and check for squareness plus symmetry
+    dim: int = grid.n_rows
+    assert dim == grid.n_cols
+    assert dim % 2 == 1
 
+    # parse fields into a flat mask of plots, surrounded by a border of rocks
+    fields: PaddedGrid = PaddedGrid.from_grid(grid, border=ord("#"))
+    start: tuple[int, int] = fields.coord(fields.find(b"S"))
+    plots: PaddedGrid = fields.translate(bytes(int(c != ord("#")) for c in range(256)))
 
-def main() -> None:
-    # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    return plots, start, dim
 
-    # get dimensions and check for squareness plus symmetry
-    dim: int = len(lines)
-    assert dim == len(lines[0])
-    assert dim % 2 == 1
 
-    # parse fields
-    fields: dict[tuple[int, int], Field] = {}
-    start: tuple[int, int]
-    for j, line in enumerate(lines):
-        for i, c in enumerate(line):
-            if c == "S":
-                start = (i, j)
-            fields[(i, j)] = Field(i, j, c != "#")
-
-    # helper to get the set of next options given previous options
-    @functools.cache
-    def get_next_options(options: frozenset[Field]) -> set[Field]:
-        next_options: set[Field] = set()
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    # parse plots, the start and the dimension of the square field
+    plots, start, dim = parse(path)
+
+    # helper to get the set of next options given previous options, both as flat indices
+    # (steps are only shared between counts from the same start, so keep the steps of one start)
+    @memoize(maxsize=2 * dim + 16)
+    def get_next_options(options: frozenset[int]) -> set[int]:
+        next_options: set[int] = set()
         for option in options:
-            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-                x = option.x + dx
-                y = option.y + dy
-                if (x, y) in fields and fields[(x, y)].is_plot:
-                    next_options.add(fields[(x, y)])
+            for offset in plots.neighbors4:
+                if plots[option + offset]:
+                    next_options.add(option + offset)
         return next_options
 
     # helper to count the number of plots reachable after n steps from a given start
     # assuming that after a large enough number of steps n_conv (height + width + some safety buffer),
     # the number will have converged and oscillates between two values
-    @functools.cache
+    @memoize(maxsize=64)
     def count_options(start: tuple[int, int], n_steps: int, n_conv: int = 2 * dim + 10) -> int:
         # when above n_conv, return count for n_conv if both even or odd, otherwise n_conv - 1
         if n_steps > n_conv:
             return count_options(start, n_conv - int((n_steps % 2) != (n_conv % 2)))
         # simulate steps
-        options: set[Field] = {fields[start]}
+        options: set[int] = {plots.index(*start)}
         for _ in range(n_steps):
             options = get_next_options(frozenset(options))
         return len(options)
@@ -73,6 +73,8 @@ def main() -> None:
     # part 1
     #
 
+    phase("part1")
+
     # results
     n_options: int = count_options(start, 64)
     print(f"{n_options=} (truth=3677)")
@@ -81,16 +83,18 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # helper to draw the options after n steps from a given start for debuggin
     def draw(start: tuple[int, int], n_steps: int) -> None:
-        options: set[Field] = {fields[start]}
+        options: set[int] = {plots.index(*start)}
         for _ in range(n_steps):
             options = get_next_options(frozenset(options))
         with open(os.path.join(this_dir, f"reach__{start[0]}_{start[1]}__{n_steps}.txt"), "w") as f:
-            for j, line in enumerate(lines):
+            for j in range(dim):
                 f.write("".join(
-                    "O" if fields[(i, j)] in options else c.replace("S", ".")
-                    for i, c in enumerate(line)
+                    "O" if plots.index(i, j) in options else ("." if plots[plots.index(i, j)] else "#")
+                    for i in range(dim)
                 ) + "\n")
 
     # after studying the input, there seem to be three patterns (thanks editor minimap):
@@ -151,6 +155,8 @@ def main() -> None:
         n_options += n_corner_14 * count_options((x, y), n_steps_corner_14 - 1)
         # 3/4 populated
         n_options += n_corner_34 * count_options((x, y), n_steps_corner_34)
+    count_cache("get_next_options", get_next_options)
+    count_cache("count_options", count_options)
 
     # results
     print(f"{n_options=} (truth=609585229256084)")
@@ -3,78 +3,173 @@
 from __future__ import annotations
 
 import os
+import sys
 import re
 from operator import mul
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.grid import PaddedGrid
+from aoc.instrument import phase
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Part:
-    num: str
+    num: bytes
     i: int
     j: int
+    value: int = field(init=False, compare=False)
 
-    def __hash__(self: Part) -> int:
-        return hash((self.num, self.i, self.j))
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "value", int(self.num))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Symbol:
-    c: str
+    c: bytes
     i: int
     j: int
 
-    def __hash__(self: Symbol) -> int:
-        return hash((self.c, self.i, self.j))
 
+# numbers and symbols, matched in a single pass over all cells
+token_cre = re.compile(rb"(\d+)|([^.\d])")
 
-def main() -> None:
-    # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
 
-    # parse potential parts and symbols using the same re.search mechanism
-    part: list[Part] = []
+def tokenize(grid: PaddedGrid) -> tuple[list[Part], list[Symbol], list[int]]:
+    # potential parts and symbols in a single pass over the flat cells, as well as the index of the
+    # part covering each cell, or -1
+    parts: list[Part] = []
     symbols: list[Symbol] = []
-    for objs, cls, expr in [(part, Part, r"\d+"), (symbols, Symbol, r"[^\.\d]")]:
-        for i, line in enumerate(lines):
-            offset: int = 0
-            while m := re.search(expr, line):
-                objs.append(cls(m.group(0), i, offset + m.start()))
-                offset += (shift := m.start() + len(m.group(0)))
-                line = line[shift:]
-
-    # keep a hashmap of all coordinates that point to a potential part
-    coords_to_parts: dict[tuple[int, int], Part] = {}
-    for part in part:
-        for d in range(len(part.num)):
-            coords_to_parts[(part.i, part.j + d)] = part
+    cells_to_parts: list[int] = [-1] * len(grid)
+    stride: int = grid.stride
+    for m in token_cre.finditer(grid.cells):
+        start, end = m.span()
+        i, j = divmod(start, stride)
+        if m.lastindex == 1:
+            cells_to_parts[start:end] = [len(parts)] * (end - start)
+            parts.append(Part(m.group(1), i - 1, j - 1))
+        else:
+            symbols.append(Symbol(m.group(2), i - 1, j - 1))
+    return parts, symbols, cells_to_parts
+
+
+@dataclass(slots=True)
+class Row:
+    # numbers as (start, end, value) and symbols as (column, byte), with columns of the row padded
+    # by one dot on each side, as well as the index of the number covering each column, or -1, and
+    # a mask of columns with symbols
+    numbers: list[tuple[int, int, int]]
+    symbols: list[tuple[int, bytes]]
+    cells: list[int]
+    symbol_mask: bytearray
+
+
+# row before the first and after the last one
+empty_row: Row = Row([], [], [], bytearray())
+
+
+def scan_row(line: bytes) -> Row:
+    line = b"." + line + b"."
+    numbers: list[tuple[int, int, int]] = []
+    symbols: list[tuple[int, bytes]] = []
+    cells: list[int] = [-1] * len(line)
+    symbol_mask: bytearray = bytearray(len(line))
+    for m in token_cre.finditer(line):
+        start, end = m.span()
+        if m.lastindex == 1:
+            cells[start:end] = [len(numbers)] * (end - start)
+            numbers.append((start, end, int(m.group(1))))
+        else:
+            symbols.append((start, m.group(2)))
+            symbol_mask[start] = 1
+    return Row(numbers, symbols, cells, symbol_mask)
+
+
+def solve_row(above: Row, row: Row, below: Row) -> tuple[int, int]:
+    # sum of parts and of gear ratios of a row, which are final once the rows around it are known
+    window: tuple[Row, Row, Row] = (above, row, below)
+    sum_part_ids: int = sum(
+        value
+        for start, end, value in row.numbers
+        if any(1 in r.symbol_mask[start - 1:end + 1] for r in window)
+    )
+
+    # numbers around gears, identified by their row in the window and index, and slicing rows so
+    # that rows of different widths do not need bounds checks
+    sum_gear_ratio: int = 0
+    for j, c in row.symbols:
+        if c != b"*":
+            continue
+        gear_nums: set[tuple[int, int]] = {
+            (k, idx)
+            for k, r in enumerate(window)
+            for idx in r.cells[j - 1:j + 2]
+            if idx >= 0
+        }
+        if len(gear_nums) == 2:
+            sum_gear_ratio += mul(*(window[k].numbers[idx][2] for k, idx in gear_nums))
+
+    return sum_part_ids, sum_gear_ratio
+
+
+def stream(lines: Iterable[str]) -> tuple[int, int]:
+    # solve both parts in a single pass over rows, keeping only a window of three rows and solving
+    # each row as soon as the row after it is read
+    sum_part_ids: int = 0
+    sum_gear_ratio: int = 0
+    window: deque[Row] = deque([empty_row], maxlen=3)
+    for line in lines:
+        window.append(scan_row(line.encode("utf-8")))
+        if len(window) == 3:
+            part_ids, gear_ratio = solve_row(*window)
+            sum_part_ids += part_ids
+            sum_gear_ratio += gear_ratio
+
+    # the last row
+    window.append(empty_row)
+    if len(window) == 3:
+        part_ids, gear_ratio = solve_row(*window)
+        sum_part_ids += part_ids
+        sum_gear_ratio += gear_ratio
+
+    return sum_part_ids, sum_gear_ratio
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    # read the grid, surrounded by a border of dots
+    grid: PaddedGrid = PaddedGrid.from_grid(Input(path).grid(), border=ord("."))
+
+    # potential parts and symbols, and the part index per cell
+    candidates, symbols, cells_to_parts = tokenize(grid)
+
+    phase("solve")
 
     # iterate over symbols and look around for actual parts
-    parts: set[Part] = set()  # overwrites
+    parts: set[int] = set()  # overwrites
     sum_gear_ratio: int = 0
     for sym in symbols:
-        # build neighbor coordinates, no need to check bounds since we do explicit hashmap lookups
-        neighbors = [
-            (sym.i - 1, sym.j - 1), (sym.i - 1, sym.j + 0), (sym.i - 1, sym.j + 1),
-            (sym.i + 0, sym.j - 1),                         (sym.i + 0, sym.j + 1),  # noqa
-            (sym.i + 1, sym.j - 1), (sym.i + 1, sym.j + 0), (sym.i + 1, sym.j + 1),
-        ]
-        # check adjacent parts, keeping track of those found for gear ratio
-        symbol_parts: set[Part] = set()
-        for coord in neighbors:
-            if (part := coords_to_parts.get(coord)):
-                parts.add(part)
-                symbol_parts.add(part)
+        # check adjacent parts via neighbor offsets, no need to check bounds thanks to the border,
+        # keeping track of those found for gear ratio
+        symbol_parts: set[int] = set()
+        i: int = grid.index(sym.j, sym.i)
+        for offset in grid.neighbors8:
+            if (part_idx := cells_to_parts[i + offset]) >= 0:
+                parts.add(part_idx)
+                symbol_parts.add(part_idx)
         # update gear ratio sum iteratively
-        if len(symbol_parts) == 2 and sym.c == "*":
-            sum_gear_ratio += mul(*(int(part.num) for part in symbol_parts))
+        if len(symbol_parts) == 2 and sym.c == b"*":
+            sum_gear_ratio += mul(*(candidates[part_idx].value for part_idx in symbol_parts))
 
     # get sum of parts
-    sum_part_ids: int = sum(int(part.num) for part in parts)
+    sum_part_ids: int = sum(candidates[part_idx].value for part_idx in parts)
 
     # results
     print(f"{sum_part_ids=} (truth=553079)")
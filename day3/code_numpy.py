@@ -0,0 +1,80 @@
+# coding: utf-8
+
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.grid import PaddedGrid
+from aoc.instrument import phase
+
+
+this_dir: str = os.path.dirname(os.path.abspath(__file__))
+
+
+def label_runs(cells: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # label per cell of runs of digits, starting at 1 and 0 for cells without digit, and the value
+    # of each run by label, with a leading 0 for no run
+    is_digit: np.ndarray = (cells >= ord("0")) & (cells <= ord("9"))
+    edges: np.ndarray = np.diff(is_digit.astype(np.int8), prepend=0, append=0)
+    starts: np.ndarray = np.flatnonzero(edges == 1)
+    lengths: np.ndarray = np.flatnonzero(edges == -1) - starts
+
+    # labels per cell
+    labels: np.ndarray = np.cumsum(edges == 1)[:len(cells)] * is_digit
+
+    # decode all runs digit by digit
+    values: np.ndarray = np.zeros(len(starts) + 1, dtype=np.int64)
+    for k in range(lengths.max(initial=0)):
+        m: np.ndarray = lengths > k
+        values[1:][m] = values[1:][m] * 10 + (cells[starts[m] + k] - ord("0"))
+
+    return labels, values
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
+    # read the grid, surrounded by a border of dots, as a flat array
+    grid: PaddedGrid = PaddedGrid.from_grid(Input(path).grid(), border=ord("."))
+    cells: np.ndarray = np.frombuffer(grid.cells, dtype=np.uint8)
+
+    # digit runs and symbols
+    labels, values = label_runs(cells)
+    is_symbol: np.ndarray = (cells != ord(".")) & (labels == 0)
+
+    phase("solve")
+
+    # dilate the symbol mask by all neighbor offsets, which never leave the array for inner cells,
+    # so that cells wrapped around by the shift are border cells that are never symbols
+    near_symbol: np.ndarray = is_symbol.copy()
+    for offset in grid.neighbors8:
+        near_symbol |= np.roll(is_symbol, offset)
+
+    # part numbers are runs that have at least one cell next to a symbol
+    is_part: np.ndarray = np.zeros(len(values), dtype=bool)
+    is_part[labels[near_symbol]] = True
+    is_part[0] = False
+    sum_part_ids: int = int(values[is_part].sum())
+
+    # labels around all gear candidates, sorted per gear so that distinct runs are counted by
+    # comparing with the previous label
+    gears: np.ndarray = np.flatnonzero(cells == ord("*"))
+    around: np.ndarray = np.sort(labels[gears[:, None] + np.array(grid.neighbors8)], axis=1)
+    distinct: np.ndarray = around != 0
+    distinct[:, 1:] &= around[:, 1:] != around[:, :-1]
+    is_gear: np.ndarray = distinct.sum(axis=1) == 2
+    ratios: np.ndarray = np.where(distinct[is_gear], values[around[is_gear]], 1).prod(axis=1)
+    sum_gear_ratio: int = int(ratios.sum())
+
+    # results
+    print(f"{sum_part_ids=} (truth=553079)")
+    print(f"{sum_gear_ratio=} (truth=84363105)")
+
+
+if __name__ == "__main__":
+    main()
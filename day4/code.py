@@ -3,48 +3,77 @@
 from __future__ import annotations
 
 import os
+import sys
 import re
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass
+from typing import Iterable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Card:
     id: int
-    winning_nums: list[int]
-    card_nums: list[int]
+    winning_nums: tuple[int, ...]
+    card_nums: tuple[int, ...]
     n_matches: int
 
 
-def main() -> None:
+def parse_card(line: str) -> Card:
+    m = re.match(r"^Card\s+(\d+):\s+(.+)\s*\|\s*(.+)\s*$", line)
+    card_id, winning_nums, card_nums = m.groups()
+    winning_nums: tuple[int, ...] = tuple(map(int, winning_nums.strip().split()))
+    card_nums: tuple[int, ...] = tuple(map(int, card_nums.strip().split()))
+    return Card(
+        id=int(card_id),
+        winning_nums=winning_nums,
+        card_nums=card_nums,
+        n_matches=len(set(winning_nums) & set(card_nums)),
+    )
+
+
+def stream(lines: Iterable[str]) -> tuple[int, int]:
+    # solve both parts in a single forward pass, keeping track of the copies won for the next cards
+    # in a queue whose length is bounded by the maximum number of matches
+    sum_points: int = 0
+    sum_num_cards: int = 0
+    copies: deque[int] = deque()
+    for line in lines:
+        card: Card = parse_card(line)
+        sum_points += 2**(card.n_matches - 1) if card.n_matches else 0
+        # this card plus all its copies, each winning one copy of the next n_matches cards
+        n: int = 1 + (copies.popleft() if copies else 0)
+        sum_num_cards += n
+        copies.extend([0] * (card.n_matches - len(copies)))
+        for i in range(card.n_matches):
+            copies[i] += n
+    return sum_points, sum_num_cards
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse lines
-    cards: list[Card] = []
-    for line in lines:
-        m = re.match(r"^Card\s+(\d+):\s+(.+)\s*\|\s*(.+)\s*$", line)
-        card_id, winning_nums, card_nums = m.groups()
-        winning_nums: list[id] = list(map(int, winning_nums.strip().split()))
-        card_nums: list[id] = list(map(int, card_nums.strip().split()))
-        cards.append(Card(
-            id=int(card_id),
-            winning_nums=winning_nums,
-            card_nums=card_nums,
-            n_matches=len(set(winning_nums) & set(card_nums)),
-        ))
+    cards: list[Card] = list(map(parse_card, lines))
 
     # part 1
+    phase("part1")
     sum_points: int = sum(
         2**(card.n_matches - 1) if card.n_matches else 0
         for card in cards
     )
 
     # part 2
+    phase("part2")
     # let's skip F-style cycle detection for now as there shouldn't be one for this to work
     # iterate in reverse order and cache number of cards won to make this O(n)
     num_cards: dict[int, int] = defaultdict(int)
@@ -3,22 +3,27 @@
 from __future__ import annotations
 
 import os
+import sys
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Mapping:
     src_start: int
     dst_start: int
     n: int
+    src_end: int = field(init=False, repr=False)
 
-    @property
-    def src_end(self) -> int:
-        return self.src_start + self.n
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "src_end", self.src_start + self.n)
 
     def has_src(self, src: int) -> bool:
         return self.src_start <= src < self.src_end
@@ -27,7 +32,7 @@ class Mapping:
         return self.dst_start + (src - self.src_start)
 
 
-@dataclass
+@dataclass(slots=True)
 class Range:
     start: int
     n: int
@@ -45,10 +50,11 @@ class Range:
         self.n -= offset
 
 
-def main() -> None:
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse seeds
     seeds: list[int] = list(map(int, [int(s.strip()) for s in lines.pop(0).split(":", 1)[1].strip().split()]))
@@ -74,6 +80,8 @@ def main() -> None:
     # part 1
     #
 
+    phase("part1")
+
     # helper to find the location for a seed
     def get_location(seed: int) -> int:
         val = seed
@@ -92,6 +100,8 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # parse seed ranges
     seed_ranges: list[Range] = []
     for i in range(len(seeds) // 2):
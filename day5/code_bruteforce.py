@@ -3,25 +3,25 @@
 from __future__ import annotations
 
 import os
+import sys
 import re
 from dataclasses import dataclass
-from multiprocessing import Pool
-from multiprocessing.pool import AsyncResult
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
+
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Mapping:
     src_start: int
     dst_start: int
     n: int
 
-    def __hash__(self):
-        return hash((self.src_start, self.dst_start, self.n))
-
     def has_src(self, src: int) -> bool:
         return self.src_start <= src < self.src_start + self.n
 
@@ -35,14 +35,11 @@ class Mapping:
         return self.dst_start + (src - self.src_start)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SeedRange:
     start: int
     n: int
 
-    def __hash__(self):
-        return hash((self.start, self.n))
-
     def has(self, seed: int) -> bool:
         return self.start <= seed < self.start + self.n
 
@@ -61,10 +58,11 @@ def get_seed_for_location_range(i, n, mappings, seed_ranges):
     return None
 
 
-def main() -> None:
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse seeds
     seeds = list(map(int, [int(s.strip()) for s in lines.pop(0).split(":", 1)[1].strip().split()]))
@@ -86,6 +84,8 @@ def main() -> None:
     # part 1
     #
 
+    phase("part1")
+
     # sort mappings by src start
     mappings1 = {name: sorted(ms, key=lambda m: m.src_start) for name, ms in mappings.items()}
 
@@ -107,6 +107,8 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # sort mappings by dst start
     mappings2 = {name: sorted(ms, key=lambda m: m.dst_start) for name, ms in mappings.items()}
 
@@ -115,7 +117,9 @@ def main() -> None:
     for i in range(len(seeds) // 2):
         seed_ranges.append(SeedRange(seeds[i * 2], seeds[i * 2 + 1]))
 
-    # go parallel :)
+    # go parallel :), multiprocessing is only imported here as it is slow to import
+    from multiprocessing import Pool
+    from multiprocessing.pool import AsyncResult
     with Pool(pool_size := 8) as pool:
         results: dict[int, int | AsyncResult | None] = {}
         hit: int | None = None
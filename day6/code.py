@@ -3,25 +3,31 @@
 from __future__ import annotations
 
 import os
+import sys
 import math
 from functools import reduce
 from operator import mul
 from dataclasses import dataclass
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
+
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Game:
     duration: int
     distance: int
 
 
-def main() -> None:
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse the games
     games: list[Game] = [
@@ -36,6 +42,8 @@ def main() -> None:
     # part 1
     #
 
+    phase("part1")
+
     # distance function
     get_distance = lambda t, t_wait: max(0, t * t_wait - t_wait ** 2)
 
@@ -56,6 +64,8 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # combine numbers into a single game
     game2: Game = Game(
         int(lines[0].split(":", 1)[1].strip().replace(" ", "")),
@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from functools import cmp_to_key
 from collections import Counter
 from enum import IntEnum
+from typing import Iterable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
@@ -50,14 +56,18 @@ class Score(IntEnum):
         return cls.__decomp__.get((n_distinct, max_count), cls.NOTHING)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Hand:
     cards: str
     bid: int
+    # scores for both parts, computed once instead of in every comparison
+    score: int = field(init=False, compare=False)
+    joker_score: int = field(init=False, compare=False)
 
-    @property
-    def score(self) -> int:
-        return Score.get(len(set(self.cards)), max(Counter(self.cards).values()))
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "score", Score.get(len(set(self.cards)), max(Counter(self.cards).values())))
+        # casting replaces all jokers, so the cast hand does not recurse any further
+        object.__setattr__(self, "joker_score", self.cast_joker().score if "J" in self.cards else self.score)
 
     def cast_joker(self) -> Hand:
         # helper to create a hand with jokers replaced by one other card
@@ -106,10 +116,41 @@ class Hand:
             return Hand("AAAAA", self.bid)
 
 
-def main() -> None:
+def get_key(cards: str, score: int, card_values: dict[str, int]) -> int:
+    # single integer that sorts like comparing scores first and then card values one by one, with
+    # 4 bits per card value
+    key: int = score
+    for card in cards:
+        key = (key << 4) | card_values[card]
+    return key
+
+
+def stream(lines: Iterable[str]) -> tuple[int, int]:
+    # the ranking requires a sort over all hands, so memory cannot be constant, but instead of hand
+    # objects only a single integer per hand and part is kept, with the bid in the lower 32 bits
+    keys1: list[int] = []
+    keys2: list[int] = []
+    for line in lines:
+        cards, bid = line.split()
+        hand: Hand = Hand(cards, int(bid))
+        keys1.append((get_key(cards, hand.score, card_values1) << 32) | hand.bid)
+        keys2.append((get_key(cards, hand.joker_score, card_values2) << 32) | hand.bid)
+
+    # sort and compute total winnings
+    mask: int = (1 << 32) - 1
+    totals: list[int] = []
+    for keys in (keys1, keys2):
+        keys.sort()
+        totals.append(sum(rank * (key & mask) for rank, key in enumerate(keys, 1)))
+        keys.clear()
+    return totals[0], totals[1]
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse hands
     hands: list[Hand] = [
@@ -140,6 +181,8 @@ def main() -> None:
     # part 1
     #
 
+    phase("part1")
+
     # sort and compute total winnings
     hands1: list[Hand] = sorted(hands, key=make_compare(lambda hand: hand.score, card_values1))
     total_winnings1: int = sum(rank * hand.bid for rank, hand in enumerate(hands1, 1))
@@ -151,8 +194,10 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # sort and compute total winnings
-    hands2: list[Hand] = sorted(hands, key=make_compare(lambda hand: hand.cast_joker().score, card_values2))
+    hands2: list[Hand] = sorted(hands, key=make_compare(lambda hand: hand.joker_score, card_values2))
     total_winnings2: int = sum(rank * hand.bid for rank, hand in enumerate(hands2, 1))
 
     # results
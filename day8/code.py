@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import os
+import sys
 import re
 import math
 from dataclasses import dataclass
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
+
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     name: str
     left: Node | None = None
@@ -21,10 +26,11 @@ class Node:
         return self.left if instruction == "L" else self.right
 
 
-def main() -> None:
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse instructions
     instructions = lines[0].strip().upper()
@@ -46,6 +52,8 @@ def main() -> None:
     # part 1
     #
 
+    phase("part1")
+
     # start traversing
     steps1: int = 0
     node: Node = nodes["AAA"]
@@ -60,6 +68,8 @@ def main() -> None:
     # part 2
     #
 
+    phase("part2")
+
     # get a nodes
     a_nodes: list[Node] = [node for node in nodes.values() if node.name.endswith("A")]
 
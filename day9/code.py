@@ -3,31 +3,58 @@
 from __future__ import annotations
 
 import os
+import sys
+from typing import Iterable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.loader import Input
+from aoc.instrument import phase
 
 
 this_dir: str = os.path.dirname(os.path.abspath(__file__))
 
 
-def main() -> None:
+# helper to get pair-wise differences
+get_diffs = lambda seq: [seq[i + 1] - seq[i] for i in range(len(seq) - 1)]
+
+
+# recursive prediction of the next value
+def get_next1(seq: list[int]) -> int:
+    return seq[0] if len(seq) == 1 else seq[-1] + get_next1(get_diffs(seq))
+
+
+# recursive prediction of the previous value
+def get_next2(seq: list[int]) -> int:
+    return seq[0] if len(seq) == 1 else seq[0] - get_next2(get_diffs(seq))
+
+
+def stream(lines: Iterable[str]) -> tuple[int, int]:
+    # sequences are independent, so predict both values per line in constant memory
+    sum_preds1: int = 0
+    sum_preds2: int = 0
+    for line in lines:
+        seq: list[int] = list(map(int, line.split()))
+        sum_preds1 += get_next1(seq)
+        sum_preds2 += get_next2(seq)
+    return sum_preds1, sum_preds2
+
+
+def main(path: str = os.path.join(this_dir, "data.txt")) -> None:
+    phase("parse")
+
     # read lines
-    with open(os.path.join(this_dir, "data.txt"), "r") as f:
-        lines: list[str] = [line for line in (line.strip() for line in f.readlines()) if line]
+    lines: list[str] = Input(path).lines()
 
     # parse sequences
     sequences: list[list[int]] = []
     for line in lines:
         sequences.append(list(map(int, line.split())))
 
-    # helper to get pair-wise differences
-    get_diffs = lambda seq: [seq[i + 1] - seq[i] for i in range(len(seq) - 1)]
-
     #
     # part 1
     #
 
-    # recursive prediction
-    def get_next1(seq: list[int]) -> int:
-        return seq[0] if len(seq) == 1 else seq[-1] + get_next1(get_diffs(seq))
+    phase("part1")
 
     # results
     sum_preds1: int = sum(map(get_next1, sequences))
@@ -37,9 +64,7 @@ def main() -> None:
     # part 2
     #
 
-    # recursive prediction
-    def get_next2(seq: list[int]) -> int:
-        return seq[0] if len(seq) == 1 else seq[0] - get_next2(get_diffs(seq))
+    phase("part2")
 
     # results
     sum_preds2: int = sum(map(get_next2, sequences))